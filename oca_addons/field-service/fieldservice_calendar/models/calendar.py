@@ -44,9 +44,12 @@ class Meeting(models.Model):
 
     def write(self, values):
         res = super().write(values)
-        if self.fsm_order_id:
+        if self._context.get("recurse_order_calendar"):
+            # avoid recursion, also allows batched writes from fsm.order
+            return res
+        for event in self.filtered("fsm_order_id"):
             if "start" in values or "duration" in values:
-                self._update_fsm_order_date()
+                event._update_fsm_order_date()
             if "partner_ids" in values:
-                self._update_fsm_assigned()
+                event._update_fsm_assigned()
         return res
@@ -1,7 +1,9 @@
 # Copyright (C) 2021 Raphaël Reverdy <raphael.reverdy@akretion.com>
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+from collections import defaultdict
+
+from odoo import Command, api, fields, models
 
 
 class FSMOrder(models.Model):
@@ -20,13 +22,20 @@ class FSMOrder(models.Model):
         return res
 
     def _create_calendar_event(self):
-        """Create entry in calendar of the team."""
-        for order in self._should_have_calendar_event():
-            order.calendar_event_id = (
-                self.env["calendar.event"]
-                .with_context(no_mail_to_attendees=True)
-                .create(order._prepare_calendar_event())
-            )
+        """Create entries in calendar of the team.
+
+        All events are prepared first and created with a single multi-create.
+        """
+        orders = self._should_have_calendar_event()
+        if not orders:
+            return
+        events = (
+            self.env["calendar.event"]
+            .with_context(no_mail_to_attendees=True)
+            .create([order._prepare_calendar_event() for order in orders])
+        )
+        for order, event in zip(orders, events, strict=True):
+            order.calendar_event_id = event
 
     def _should_have_calendar_event(self):
         return self.filtered("team_id.calendar_user_id").filtered(
@@ -54,8 +63,8 @@ class FSMOrder(models.Model):
 
     def write(self, vals):
         old_persons = {}
-        for rec in self:
-            old_persons[rec.id] = rec.person_id
+        if "person_id" in vals:
+            old_persons = {rec.id: rec.person_id for rec in self}
         res = super().write(vals)
         to_update = self.create_or_delete_calendar()
         with_calendar = to_update.filtered("calendar_event_id")
@@ -87,17 +96,23 @@ class FSMOrder(models.Model):
         if self._context.get("recurse_order_calendar"):
             # avoid recursion
             return
-        to_apply = {}
-        to_apply["start"] = self.scheduled_date_start
-        to_apply["stop"] = self.scheduled_date_end
-        # always write start and stop in order to calc duration
-        self.mapped("calendar_event_id").with_context(
-            recurse_order_calendar=True
-        ).write(to_apply)
+        # group events sharing the same dates: one write per group
+        events_by_dates = defaultdict(lambda: self.env["calendar.event"])
+        for rec in self:
+            key = (rec.scheduled_date_start, rec.scheduled_date_end)
+            events_by_dates[key] |= rec.calendar_event_id
+        for (start, stop), events in events_by_dates.items():
+            # always write start and stop in order to calc duration
+            events.with_context(recurse_order_calendar=True).write(
+                {"start": start, "stop": stop}
+            )
 
     def update_calendar_location(self):
+        events_by_location = defaultdict(lambda: self.env["calendar.event"])
         for rec in self:
-            rec.calendar_event_id.location = rec._serialize_location()
+            events_by_location[rec._serialize_location()] |= rec.calendar_event_id
+        for location, events in events_by_location.items():
+            events.write({"location": location})
 
     def _serialize_location(self):
         partner_id = self.location_id.partner_id
@@ -107,11 +122,21 @@ class FSMOrder(models.Model):
         if self._context.get("recurse_order_calendar"):
             # avoid recursion
             return
+        # group events by attendee diff: one partner_ids write per group
+        events_by_diff = defaultdict(lambda: self.env["calendar.event"])
         for rec in self:
-            with_ctx = rec.calendar_event_id.with_context(recurse_order_calendar=True)
-            if old_persons.get(rec.id):
+            old_partner = old_persons.get(rec.id, self.env["fsm.person"]).partner_id
+            key = (old_partner.id, rec.person_id.partner_id.id)
+            events_by_diff[key] |= rec.calendar_event_id
+        for (old_partner_id, new_partner_id), events in events_by_diff.items():
+            commands = []
+            if old_partner_id:
                 # remove buddy
-                with_ctx.partner_ids = [(3, old_persons[rec.id].partner_id.id, False)]
-            if rec.person_id:
+                commands.append(Command.unlink(old_partner_id))
+            if new_partner_id:
                 # add the new one
-                with_ctx.partner_ids = [(4, rec.person_id.partner_id.id, False)]
+                commands.append(Command.link(new_partner_id))
+            if commands:
+                events.with_context(recurse_order_calendar=True).write(
+                    {"partner_ids": commands}
+                )
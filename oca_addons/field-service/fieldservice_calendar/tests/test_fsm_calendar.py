@@ -94,3 +94,35 @@ class TestFSMOrder(TransactionCase):
         self.assertTrue(
             len(evt.partner_ids) == 2, "Not workers should be removed from attendees"
         )
+
+    def test_fsm_order_bulk_calendar_sync(self):
+        start = fields.Datetime.today()
+        orders = self.Order.create(
+            [
+                {
+                    "location_id": self.test_location.id,
+                    "scheduled_date_start": start,
+                    "scheduled_duration": 2,
+                    "person_id": self.person_id.id,
+                }
+                for _i in range(3)
+            ]
+        )
+        events = orders.calendar_event_id
+        self.assertEqual(len(events), 3)
+        self.assertTrue(all(self.person_id.partner_id in e.partner_ids for e in events))
+        # mass rescheduling and reassignment
+        new_start = fields.Datetime.add(start, days=1)
+        orders.write(
+            {
+                "scheduled_date_start": new_start,
+                "location_id": self.location_1.id,
+                "person_id": self.person_id3.id,
+            }
+        )
+        location = orders[0]._serialize_location()
+        for event in events:
+            self.assertEqual(event.start, new_start)
+            self.assertEqual(event.location, location)
+            self.assertIn(self.person_id3.partner_id, event.partner_ids)
+            self.assertNotIn(self.person_id.partner_id, event.partner_ids)
@@ -8,12 +8,13 @@ class StockMove(models.Model):
 
     def prepare_equipment_values(self, move_line):
         move = move_line.move_id
+        fsm_order = move.picking_id.fsm_order_id or move.fsm_order_id
         return {
             "name": f"{move_line.product_id.name} ({move_line.lot_id.name})",
             "product_id": move_line.product_id.id,
             "lot_id": move_line.lot_id.id,
-            "location_id": move.fsm_order_id.location_id.id,
-            "current_location_id": move.fsm_order_id.location_id.id,
+            "location_id": fsm_order.location_id.id,
+            "current_location_id": fsm_order.location_id.id,
             "current_stock_location_id": move_line.location_dest_id.id,
         }
 
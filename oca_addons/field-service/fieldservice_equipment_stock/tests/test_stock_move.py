@@ -52,3 +52,49 @@ class TestStockMove(TransactionCase):
         stockMoveInA._action_done()
 
         self.assertEqual("done", stockMoveInA.state)
+
+    def test_prepare_equipment_values_picking_fsm_order(self):
+        fsm_location = self.env.ref("fieldservice.test_location")
+        fsm_order = self.env["fsm.order"].create({"location_id": fsm_location.id})
+        product = self.env["product.product"].create(
+            {"name": "product B", "type": "product", "tracking": "serial"}
+        )
+        picking = self.env["stock.picking"].create(
+            {
+                "picking_type_id": self.env.ref("stock.picking_type_in").id,
+                "location_id": self.supplier_location.id,
+                "location_dest_id": self.stock_location.id,
+                "fsm_order_id": fsm_order.id,
+                "move_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": product.name,
+                            "product_id": product.id,
+                            "product_uom": product.uom_id.id,
+                            "product_uom_qty": 1,
+                            "location_id": self.supplier_location.id,
+                            "location_dest_id": self.stock_location.id,
+                        },
+                    )
+                ],
+            }
+        )
+        picking.action_confirm()
+        move = picking.move_ids
+        self.assertFalse(move.fsm_order_id)
+        move_line = self.env["stock.move.line"].create(
+            {
+                "move_id": move.id,
+                "picking_id": picking.id,
+                "product_id": product.id,
+                "lot_name": "serial B",
+                "quantity": 1,
+                "location_id": self.supplier_location.id,
+                "location_dest_id": self.stock_location.id,
+            }
+        )
+        values = self.Move.prepare_equipment_values(move_line)
+        self.assertEqual(values["location_id"], fsm_location.id)
+        self.assertEqual(values["current_location_id"], fsm_location.id)
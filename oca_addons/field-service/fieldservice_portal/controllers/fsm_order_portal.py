@@ -1,10 +1,16 @@
+import base64
+import binascii
+import json
 from collections import OrderedDict
+from datetime import datetime
 from operator import itemgetter
 
-from odoo import _, http
+from werkzeug.urls import url_encode
+
+from odoo import _, fields, http
 from odoo.exceptions import AccessError
 from odoo.http import request
-from odoo.osv.expression import OR
+from odoo.osv.expression import AND, OR
 from odoo.tools import groupby as groupbyelem
 
 from odoo.addons.portal.controllers.portal import CustomerPortal
@@ -12,6 +18,10 @@ from odoo.addons.portal.controllers.portal import pager as portal_pager
 
 
 class CustomerPortal(CustomerPortal):
+    # Upper bound of the order count computed for the pager. Beyond it the
+    # count is approximate: set to 0 to always count exactly.
+    _fsm_order_count_limit = 1000
+
     def _prepare_home_portal_values(self, counters):
         values = super()._prepare_home_portal_values(counters)
         if "fsm_order_count" in counters:
@@ -38,6 +48,57 @@ class CustomerPortal(CustomerPortal):
             raise
         return fsm_order.sudo()
 
+    def _fsm_order_encode_cursor(self, page, sortby, seek, fsm_order):
+        """Build the keyset cursor pointing after ``fsm_order``."""
+        field_name, _desc = seek
+        value = fsm_order[field_name]
+        if isinstance(value, datetime):
+            value = fields.Datetime.to_string(value)
+        payload = {"p": page, "s": sortby, "v": value or None, "id": fsm_order.id}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def _fsm_order_decode_cursor(self, cursor, page, sortby):
+        """Return ``(value, id)`` of a valid cursor for this page, else None."""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, binascii.Error):
+            return None
+        if (
+            not isinstance(payload, dict)
+            or payload.get("p") != page
+            or payload.get("s") != sortby
+            or not isinstance(payload.get("id"), int)
+            or not isinstance(payload.get("v"), str | None)
+        ):
+            return None
+        return payload["v"], payload["id"]
+
+    def _fsm_order_seek_domain(self, seek, value, last_id):
+        """Domain of the records following ``(value, last_id)`` in seek order.
+
+        Descending orders put NULL values first, as PostgreSQL does.
+        """
+        field_name, desc = seek
+        id_op = "<" if desc else ">"
+        if value is None:
+            if desc:
+                return OR(
+                    [
+                        [(field_name, "=", False), ("id", id_op, last_id)],
+                        [(field_name, "!=", False)],
+                    ]
+                )
+            return [(field_name, "=", False), ("id", id_op, last_id)]
+        domain = OR(
+            [
+                [(field_name, "<" if desc else ">", value)],
+                [(field_name, "=", value), ("id", id_op, last_id)],
+            ]
+        )
+        if not desc:
+            domain = OR([domain, [(field_name, "=", False)]])
+        return domain
+
     def fsm_order_get_page_view_values(self, fsm_order, **kwargs):
         values = {
             "page_name": "fsm_order",
@@ -69,15 +130,25 @@ class CustomerPortal(CustomerPortal):
         groupby=None,
         search=None,
         search_in="all",
+        cursor=None,
         **kw,
     ):
         values = self._prepare_portal_layout_values()
         FsmOrder = request.env["fsm.order"]
         domain = self._prepare_fsm_orders_domain()
 
+        # "seek" sortings are paginated with a keyset cursor instead of offsets
         searchbar_sortings = {
-            "date": {"label": _("Newest"), "order": "request_early desc"},
-            "name": {"label": _("Name"), "order": "name"},
+            "date": {
+                "label": _("Newest"),
+                "order": "request_early desc, id desc",
+                "seek": ("request_early", True),
+            },
+            "name": {
+                "label": _("Name"),
+                "order": "name, id",
+                "seek": ("name", False),
+            },
             "stage": {"label": _("Stage"), "order": "stage_id"},
             "location": {"label": _("Location"), "order": "location_id"},
             "type": {"label": _("Type"), "order": "type"},
@@ -128,18 +199,15 @@ class CustomerPortal(CustomerPortal):
         # search filters (by stage)
         searchbar_filters = OrderedDict(
             (
-                str(stage.name),
+                str(stage_name),
                 {
-                    "label": stage.name,
-                    "domain": [("stage_id", "=", stage.id)],
+                    "label": stage_name,
+                    "domain": [("stage_id", "=", stage_id)],
                 },
             )
-            for stage in request.env["fsm.stage"].search(
-                [
-                    ("stage_type", "=", "order"),
-                    ("portal_visible", "=", True),
-                ]
-            )
+            for stage_id, stage_name in request.env[
+                "fsm.stage"
+            ]._get_portal_order_stages()
         )
         searchbar_filters.update(
             {
@@ -160,23 +228,60 @@ class CustomerPortal(CustomerPortal):
             filterby = "open"
         domain += searchbar_filters[filterby]["domain"]
 
-        # count for pager
-        fsm_order_count = FsmOrder.search_count(domain)
+        # count for pager, capped to what is needed to reach the next page
+        count_limit = None
+        if self._fsm_order_count_limit:
+            count_limit = max(
+                self._fsm_order_count_limit, (page + 1) * self._items_per_page + 1
+            )
+        fsm_order_count = FsmOrder.search_count(domain, limit=count_limit)
+        url_args = {
+            "sortby": sortby,
+            "filterby": filterby,
+            "groupby": groupby,
+            "search_in": search_in,
+            "search": search,
+        }
         # pager
         pager = portal_pager(
             url="/my/fsm_orders",
-            url_args={},
+            url_args={k: v for k, v in url_args.items() if v},
             total=fsm_order_count,
             page=page,
             step=self._items_per_page,
         )
         # content according to pager and archive selected
-        fsm_orders = FsmOrder.search(
-            domain,
-            order=order,
-            limit=self._items_per_page,
-            offset=pager["offset"],
+        seek = searchbar_sortings[sortby].get("seek")
+        position = (
+            seek and cursor and self._fsm_order_decode_cursor(cursor, page, sortby)
         )
+        if position:
+            fsm_orders = FsmOrder.search(
+                AND([domain, self._fsm_order_seek_domain(seek, *position)]),
+                order=order,
+                limit=self._items_per_page,
+            )
+        else:
+            fsm_orders = FsmOrder.search(
+                domain,
+                order=order,
+                limit=self._items_per_page,
+                offset=pager["offset"],
+            )
+        next_page = pager["page_next"]["num"]
+        if seek and fsm_orders and next_page != pager["page"]["num"]:
+            next_cursor = self._fsm_order_encode_cursor(
+                next_page, sortby, seek, fsm_orders[-1]
+            )
+            pager["page_next"]["url"] = "/my/fsm_orders/page/{}?{}".format(
+                next_page,
+                url_encode(
+                    dict(
+                        {k: v for k, v in url_args.items() if v},
+                        cursor=next_cursor,
+                    )
+                ),
+            )
 
         if groupby == "none":
             grouped_orders = [fsm_orders] if fsm_orders else []
@@ -192,6 +297,10 @@ class CustomerPortal(CustomerPortal):
                 "grouped_orders": grouped_orders,
                 "page_name": "fsm_order",
                 "pager": pager,
+                "fsm_order_count": fsm_order_count,
+                "fsm_order_count_approximate": bool(
+                    count_limit and fsm_order_count >= count_limit
+                ),
                 "default_url": "/my/fsm_orders",
                 "searchbar_sortings": searchbar_sortings,
                 "searchbar_groupby": searchbar_groupby,
@@ -0,0 +1,23 @@
+# Copyright (C) 2025, Brian McMaster
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, tools
+
+
+class FSMLocation(models.Model):
+    _inherit = "fsm.location"
+
+    def init(self):
+        res = super().init()
+        # the portal searches orders on "location_id.name", which is stored
+        # on the partner of the location, next to its btree index
+        if self.env.registry.has_trigram:
+            Partner = self.env["res.partner"]
+            tools.create_index(
+                self.env.cr,
+                "fsm_location_name_trgm_index",
+                Partner._table,
+                ["name gin_trgm_ops"],
+                method="gin",
+            )
+        return res
@@ -0,0 +1,29 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models, tools
+
+
+class FSMOrder(models.Model):
+    _inherit = "fsm.order"
+
+    def init(self):
+        res = super().init()
+        # keyset pagination of the portal order list sorted by date
+        tools.create_index(
+            self.env.cr,
+            "fsm_order_request_early_id_index",
+            self._table,
+            ["request_early", "id"],
+        )
+        # trigram indexes back the portal "ilike" search, next to the btree
+        # index of the name used to sort and seek the order list
+        if self.env.registry.has_trigram:
+            for fname in ("name", "description"):
+                tools.create_index(
+                    self.env.cr,
+                    f"fsm_order_{fname}_trgm_index",
+                    self._table,
+                    [f"{fname} gin_trgm_ops"],
+                    method="gin",
+                )
+        return res
@@ -1,7 +1,7 @@
 # Copyright (C) 2025, Brian McMaster
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import fields, models
+from odoo import api, fields, models, tools
 
 
 class FSMStage(models.Model):
@@ -12,3 +12,36 @@ class FSMStage(models.Model):
         default=True,
         help="Enable to display field service orders based on it's stage in the portal",
     )
+
+    @api.model
+    def _get_portal_order_stages(self):
+        """Return ``(id, name)`` of the order stages visible in the portal.
+
+        Cached per language, until an order stage is created, removed or
+        modified.
+        """
+        return self._get_portal_order_stages_cached(
+            self._get_portal_order_stages_version()
+        )
+
+    @api.model
+    @tools.ormcache("self.env.lang", "version")
+    def _get_portal_order_stages_cached(self, version):
+        stages = self.sudo().search(
+            [("stage_type", "=", "order"), ("portal_visible", "=", True)]
+        )
+        return tuple((stage.id, stage.name) for stage in stages)
+
+    @api.model
+    def _get_portal_order_stages_version(self):
+        """Version of the order stages, changing whenever one of them is
+        created, removed or modified, in a single cheap query."""
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT COUNT(*), MAX(id), MAX(write_date)
+            FROM fsm_stage
+            WHERE stage_type = 'order'
+            """
+        )
+        return self.env.cr.fetchone()
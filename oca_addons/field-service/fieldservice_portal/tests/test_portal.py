@@ -1,9 +1,15 @@
 import json
+from unittest.mock import patch
 
+from odoo import tools
 from odoo.exceptions import AccessError
 from odoo.http import Request
 from odoo.tests.common import HttpCase, TransactionCase, tagged
 
+from odoo.addons.fieldservice_portal.controllers.fsm_order_portal import (
+    CustomerPortal,
+)
+
 
 @tagged("post_install", "-at_install")
 class TestUsersHttp(HttpCase, TransactionCase):
@@ -169,3 +175,54 @@ class TestUsersHttp(HttpCase, TransactionCase):
             headers={"Content-Type": "application/json"},
         ).json()
         self.assertEqual(response["result"]["fsm_order_count"], 1)
+
+    def test_fsm_order_keyset_pagination(self):
+        location = self.env.ref("fieldservice.test_location")
+        orders = self.env["fsm.order"].create(
+            [{"location_id": location.id, "name": "KEYSET %s" % i} for i in range(5)]
+        )
+        domain = [("id", "in", orders.ids)]
+        controller = CustomerPortal()
+        for seek, order in (
+            (("name", False), "name, id"),
+            (("request_early", True), "request_early desc, id desc"),
+        ):
+            expected = self.env["fsm.order"].search(domain, order=order)
+            cursor = controller._fsm_order_encode_cursor(2, "x", seek, expected[1])
+            position = controller._fsm_order_decode_cursor(cursor, 2, "x")
+            self.assertTrue(position)
+            self.assertFalse(controller._fsm_order_decode_cursor(cursor, 3, "x"))
+            following = self.env["fsm.order"].search(
+                domain + controller._fsm_order_seek_domain(seek, *position),
+                order=order,
+            )
+            self.assertEqual(following, expected[2:])
+        self.assertFalse(controller._fsm_order_decode_cursor("garbage", 2, "x"))
+
+    def test_fsm_order_portal_stage_cache(self):
+        Stage = self.env["fsm.stage"]
+        stages = Stage._get_portal_order_stages()
+        stage = Stage.browse(stages[0][0])
+        # the cache is versioned, the registry caches are left untouched
+        with patch.object(type(self.env.registry), "clear_cache") as clear_cache:
+            stage.portal_visible = False
+            self.assertNotIn(stage.id, dict(Stage._get_portal_order_stages()))
+            stage.name = "Renamed Stage"
+            stage.portal_visible = True
+            self.assertEqual(
+                dict(Stage._get_portal_order_stages())[stage.id], "Renamed Stage"
+            )
+        clear_cache.assert_not_called()
+
+    def test_fsm_order_portal_indexes(self):
+        indexes = ["fsm_order_request_early_id_index"]
+        if self.env.registry.has_trigram:
+            indexes += [
+                "fsm_order_name_trgm_index",
+                "fsm_order_description_trgm_index",
+                "fsm_location_name_trgm_index",
+            ]
+        for index in indexes:
+            self.assertTrue(tools.index_exists(self.env.cr, index))
+        # the btree index on the name backing the seek is kept
+        self.assertTrue(tools.index_exists(self.env.cr, "fsm_order_name_index"))
@@ -1,7 +1,9 @@
 # Copyright (C) 2019 Brian McMaster
 # Copyright (C) 2019 Open Source Integrators
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
-from odoo import _, api, fields, models
+from collections import defaultdict
+
+from odoo import Command, _, api, fields, models
 from odoo.exceptions import ValidationError
 
 
@@ -28,16 +30,22 @@ class SaleOrder(models.Model):
 
     @api.depends("order_line")
     def _compute_fsm_order_ids(self):
+        fsm_orders = self.env["fsm.order"].search_fetch(
+            [
+                "|",
+                ("sale_id", "in", self.ids),
+                ("sale_line_id", "in", self.order_line.ids),
+            ],
+            ["sale_id", "sale_line_id"],
+        )
+        fsm_ids_by_sale = defaultdict(list)
+        for fsm in fsm_orders:
+            for sale_id in {fsm.sale_id.id, fsm.sale_line_id.order_id.id}:
+                fsm_ids_by_sale[sale_id].append(fsm.id)
         for sale in self:
-            fsm = self.env["fsm.order"].search(
-                [
-                    "|",
-                    ("sale_id", "=", sale.id),
-                    ("sale_line_id", "in", sale.order_line.ids),
-                ]
-            )
-            sale.fsm_order_ids = fsm
-            sale.fsm_order_count = len(sale.fsm_order_ids)
+            fsm_ids = fsm_ids_by_sale[sale._origin.id]
+            sale.fsm_order_ids = [Command.set(fsm_ids)]
+            sale.fsm_order_count = len(fsm_ids)
 
     @api.depends("partner_id", "partner_shipping_id")
     def _compute_fsm_location_id(self):
@@ -46,18 +54,41 @@ class SaleOrder(models.Model):
         the partner_shipping_id or the partner_id.commercial_partner_id if
         they are FS locations.
         """
+        location_by_partner = self._get_fsm_location_by_partner(
+            self.partner_id
+            | self.partner_shipping_id
+            | self.partner_id.commercial_partner_id
+        )
         for so in self:
             if so.partner_id.fsm_location:
-                domain = [("partner_id", "=", so.partner_id.id)]
+                partners = so.partner_id
             else:
-                domain = [
-                    "|",
-                    "|",
-                    ("partner_id", "=", so.partner_id.id),
-                    ("partner_id", "=", so.partner_shipping_id.id),
-                    ("partner_id", "=", so.partner_id.commercial_partner_id.id),
-                ]
-            so.fsm_location_id = self.env["fsm.location"].search(domain, limit=1)
+                partners = (
+                    so.partner_id
+                    | so.partner_shipping_id
+                    | so.partner_id.commercial_partner_id
+                )
+            candidates = [
+                location_by_partner[partner.id]
+                for partner in partners
+                if partner.id in location_by_partner
+            ]
+            # Keep the first location in the search order, as a search on
+            # all the partners at once would
+            so.fsm_location_id = min(candidates)[1] if candidates else False
+
+    def _get_fsm_location_by_partner(self, partners):
+        """
+        Map the id of each partner to the first FS location linked to it,
+        as a tuple (position in the search order, location).
+        """
+        location_by_partner = {}
+        locations = self.env["fsm.location"].search(
+            [("partner_id", "in", partners.ids)]
+        )
+        for index, location in enumerate(locations):
+            location_by_partner.setdefault(location.partner_id.id, (index, location))
+        return location_by_partner
 
     def _prepare_line_fsm_values(self, line):
         """
@@ -66,7 +97,10 @@ class SaleOrder(models.Model):
         self.ensure_one()
         templates = line.product_id.fsm_order_template_id
         vals = self._prepare_fsm_values(
-            so_id=self.id, sol_id=line.id, template_id=templates.id
+            so_id=self.id,
+            sol_id=line.id,
+            template_id=templates.id,
+            templates=templates,
         )
         return vals
 
@@ -77,7 +111,11 @@ class SaleOrder(models.Model):
         self.ensure_one()
         template_id = kwargs.get("template_id", False)
         template_ids = kwargs.get("template_ids", [template_id])
-        templates = self.env["fsm.template"].search([("id", "in", template_ids)])
+        templates = kwargs.get("templates")
+        if templates is None:
+            templates = self.env["fsm.template"].browse(
+                sorted({tid for tid in template_ids if tid})
+            )
         note = ""
         hours = 0.0
         categories = self.env["fsm.category"]
@@ -101,27 +139,40 @@ class SaleOrder(models.Model):
 
     def _field_service_generate_sale_fsm_orders(self, new_fsm_sol):
         """
-        Generate the FSM Order for this sale order if it doesn't exist.
+        Generate the FSM Order of each sale order of the given lines if it
+        doesn't exist.
         """
-        self.ensure_one()
         new_fsm_orders = self.env["fsm.order"]
+        if not new_fsm_sol:
+            return new_fsm_orders
 
-        if new_fsm_sol:
-            fsm_by_sale = self.env["fsm.order"].search(
+        sol_by_sale = new_fsm_sol.grouped("order_id")
+        fsm_by_sale = (
+            self.env["fsm.order"]
+            .search(
                 [
-                    ("sale_id", "=", self.id),
+                    ("sale_id", "in", new_fsm_sol.order_id.ids),
                     ("sale_line_id", "=", False),
                     ("is_closed", "=", False),
                 ]
             )
-            if not fsm_by_sale:
-                templates = new_fsm_sol.product_id.fsm_order_template_id
-                vals = self._prepare_fsm_values(
-                    so_id=self.id, template_ids=templates.ids
-                )
-                fsm_by_sale = self.env["fsm.order"].sudo().create(vals)
-                new_fsm_orders |= fsm_by_sale
-            new_fsm_sol.write({"fsm_order_id": fsm_by_sale.id})
+            .grouped("sale_id")
+        )
+        sales_to_generate = []
+        vals_list = []
+        for sale, lines in sol_by_sale.items():
+            if sale in fsm_by_sale:
+                continue
+            templates = lines.product_id.fsm_order_template_id
+            sales_to_generate.append(sale)
+            vals_list.append(
+                sale._prepare_fsm_values(so_id=sale.id, template_ids=templates.ids)
+            )
+        if vals_list:
+            new_fsm_orders = self.env["fsm.order"].sudo().create(vals_list)
+            fsm_by_sale.update(zip(sales_to_generate, new_fsm_orders, strict=True))
+        for sale, lines in sol_by_sale.items():
+            lines.write({"fsm_order_id": fsm_by_sale[sale][:1].id})
 
         return new_fsm_orders
 
@@ -131,35 +182,41 @@ class SaleOrder(models.Model):
 
         Override this method to filter lines to generate FSM Orders for.
         """
-        self.ensure_one()
         new_fsm_orders = self.env["fsm.order"]
+        if not new_fsm_sol:
+            return new_fsm_orders
 
-        for line in new_fsm_sol:
-            vals = self._prepare_line_fsm_values(line)
-            fsm_by_line = self.env["fsm.order"].sudo().create(vals)
+        vals_list = [
+            line.order_id._prepare_line_fsm_values(line) for line in new_fsm_sol
+        ]
+        new_fsm_orders = self.env["fsm.order"].sudo().create(vals_list)
+        for line, fsm_by_line in zip(new_fsm_sol, new_fsm_orders, strict=True):
             line.write({"fsm_order_id": fsm_by_line.id})
-            new_fsm_orders |= fsm_by_line
 
         return new_fsm_orders
 
     def _field_service_generate(self):
         """
-        Generate FSM Orders for this sale order.
+        Generate FSM Orders for these sale orders.
 
         Override this method to add new field_service_tracking types.
         """
-        self.ensure_one()
         new_fsm_orders = self.env["fsm.order"]
+        order_lines = self.order_line
+        # Read the templates of all the lines at once
+        order_lines.product_id.fsm_order_template_id.fetch(
+            ["instructions", "duration", "category_ids"]
+        )
 
         # Process lines set to FSM Sale
-        new_fsm_sale_sol = self.order_line.filtered(
+        new_fsm_sale_sol = order_lines.filtered(
             lambda x: x.product_id.field_service_tracking == "sale"
             and (not x.fsm_order_id or x.fsm_order_id.is_closed)
         )
         new_fsm_orders |= self._field_service_generate_sale_fsm_orders(new_fsm_sale_sol)
 
         # Create new FSM Order for lines set to FSM Line
-        new_fsm_line_sol = self.order_line.filtered(
+        new_fsm_line_sol = order_lines.filtered(
             lambda x: x.product_id.field_service_tracking == "line"
             and (not x.fsm_order_id or x.fsm_order_id.is_closed)
         )
@@ -174,15 +231,13 @@ class SaleOrder(models.Model):
         :rtype: list(FSM Orders)
         :return: list of newly created FSM Orders
         """
-        created_fsm_orders = self.env["fsm.order"]
+        created_fsm_orders = self._field_service_generate()
 
+        # If FSM Orders were created, post a message to the Sale Orders
+        fsm_orders_by_sale = created_fsm_orders.grouped("sale_id")
         for sale in self:
-            new_fsm_orders = self._field_service_generate()
-
-            if len(new_fsm_orders) > 0:
-                created_fsm_orders |= new_fsm_orders
-                # If FSM Orders were created, post a message to the Sale Order
-                sale._post_fsm_message(new_fsm_orders)
+            if sale in fsm_orders_by_sale:
+                sale._post_fsm_message(fsm_orders_by_sale[sale])
 
         return created_fsm_orders
 
@@ -206,15 +261,14 @@ class SaleOrder(models.Model):
     def _action_confirm(self):
         """On SO confirmation, some lines generate field service orders."""
         result = super()._action_confirm()
-        if any(
-            sol.product_id.field_service_tracking != "no"
-            for sol in self.order_line.filtered(
-                lambda x: x.display_type not in ("line_section", "line_note")
-            )
-        ):
-            if not self.fsm_location_id:
+        fsm_sales = self.order_line.filtered(
+            lambda x: x.display_type not in ("line_section", "line_note")
+            and x.product_id.field_service_tracking != "no"
+        ).order_id
+        if fsm_sales:
+            if any(not sale.fsm_location_id for sale in fsm_sales):
                 raise ValidationError(_("FSM Location must be set"))
-            self._field_service_generation()
+            fsm_sales._field_service_generation()
         return result
 
     def action_view_fsm_order(self):
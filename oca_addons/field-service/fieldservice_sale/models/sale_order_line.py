@@ -52,9 +52,9 @@ class SaleOrderLine(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         lines = super().create(vals_list)
-        for line in lines:
-            if line.state == "sale":
-                line.order_id._field_service_generation()
+        lines.filtered(
+            lambda line: line.state == "sale"
+        ).order_id._field_service_generation()
         return lines
 
     def _get_invoiceable_fsm_order_domain(self):
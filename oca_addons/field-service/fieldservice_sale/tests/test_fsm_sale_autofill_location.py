@@ -96,3 +96,23 @@ class FSMSale(TransactionCase):
             so_form.partner_id = self.partner
         so = so_form.save()
         self.assertEqual(so.fsm_location_id, self.location1)
+
+    def test_04_autofill_so_fsm_location_batch(self):
+        """Check location autofill of several SO created at once
+
+        The first SO partner is an FSM location linked to location 2, the
+        second SO partner is not an FSM location but location 1 is linked to
+        its commercial partner => expect location 2 and location 1
+        """
+        self.partner.fsm_location = True
+        self.location1.partner_id = self.commercial_partner
+        self.location2.partner_id = self.partner
+        self.location3.partner_id = self.shipping_partner
+        partner2 = self.env["res.partner"].create(
+            {"name": "Child Partner 2", "parent_id": self.commercial_partner.id}
+        )
+        sale_orders = self.env["sale.order"].create(
+            [{"partner_id": self.partner.id}, {"partner_id": partner2.id}]
+        )
+        self.assertEqual(sale_orders[0].fsm_location_id, self.location2)
+        self.assertEqual(sale_orders[1].fsm_location_id, self.location1)
@@ -1,6 +1,8 @@
 # Copyright (C) 2019 Brian McMaster <brian@mcmpest.com>
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+from unittest.mock import patch
+
 from odoo import fields
 from odoo.exceptions import ValidationError
 
@@ -488,6 +490,39 @@ class TestFSMSaleOrder(TestFSMSale):
             len(invoices.ids), 1, "FSM Sale: Sale Order 4 should create 1 invoice"
         )
 
+    def test_sale_order_batch(self):
+        """Test confirming several sale orders at once.
+        - The FSM orders of all the sale orders are created at once.
+        - Each Sale Order Line is linked to its FSM Order.
+        """
+        sale_orders = self.sale_order_1 | self.sale_order_3 | self.sale_order_4
+        FSMOrder = self.env.registry["fsm.order"]
+        with patch.object(
+            FSMOrder, "create", side_effect=FSMOrder.create, autospec=True
+        ) as create:
+            sale_orders.action_confirm()
+        self.assertEqual(create.call_count, 2)
+        self.assertEqual(len(self.sale_order_1.fsm_order_ids), 1)
+        self.assertEqual(len(self.sale_order_3.fsm_order_ids), 2)
+        self.assertEqual(len(self.sale_order_4.fsm_order_ids), 3)
+        for sol in (
+            self.sol_service_per_line_2,
+            self.sol_service_per_line_3,
+            self.sol_service_per_line_4,
+            self.sol_service_per_line_5,
+        ):
+            self.assertEqual(sol.fsm_order_id.sale_line_id, sol)
+        self.assertEqual(
+            self.sol_service_per_order_2.fsm_order_id,
+            self.sol_service_per_order_3.fsm_order_id,
+        )
+        self.assertFalse(self.sol_service_per_order_2.fsm_order_id.sale_line_id)
+        self.assertEqual(
+            self.sol_service_per_order_2.fsm_order_id.scheduled_duration,
+            self.fsm_per_order_1.fsm_order_template_id.duration
+            + self.fsm_per_order_2.fsm_order_template_id.duration,
+        )
+
     def test_sale_order_5(self):
         """Test ValidationError isn't raised if order line
         display_type in ("line_section", "line_note")
@@ -2,7 +2,9 @@
 # Copyright (C) 2019 Open Source Integrators
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+from collections import defaultdict
+
+from odoo import Command, api, fields, models
 
 
 class SaleOrder(models.Model):
@@ -19,11 +21,17 @@ class SaleOrder(models.Model):
 
     @api.depends("order_line.product_id")
     def _compute_fsm_recurring_ids(self):
+        fsm_recurrings = self.env["fsm.recurring"].search_fetch(
+            [("sale_line_id", "in", self.order_line.ids)], ["sale_line_id"]
+        )
+        fsm_recurring_ids_by_sale = defaultdict(list)
+        for fsm_recurring in fsm_recurrings:
+            sale = fsm_recurring.sale_line_id.order_id
+            fsm_recurring_ids_by_sale[sale.id].append(fsm_recurring.id)
         for order in self:
-            order.fsm_recurring_ids = self.env["fsm.recurring"].search(
-                [("sale_line_id", "in", order.order_line.ids)]
-            )
-            order.fsm_recurring_count = len(order.fsm_recurring_ids)
+            fsm_recurring_ids = fsm_recurring_ids_by_sale[order._origin.id]
+            order.fsm_recurring_ids = [Command.set(fsm_recurring_ids)]
+            order.fsm_recurring_count = len(fsm_recurring_ids)
 
     def action_view_fsm_recurring(self):
         fsm_recurrings = self.mapped("fsm_recurring_ids")
@@ -170,3 +170,17 @@ class TestFSMSaleRecurring(TestFSMSale):
             """FSM Sale Recurring: Sale Order should create
                1 FSM Recurring Order""",
         )
+
+    def test_fsm_sale_order_recurring_batch(self):
+        """Test the FSM Recurring Orders of several Sale Orders computed
+        at once.
+        """
+        sale_orders = self.sale_order_recur | self.sale_order_recur2 | self.sale_order
+        sale_orders.action_confirm()
+        sale_orders.invalidate_recordset(["fsm_recurring_ids", "fsm_recurring_count"])
+        self.assertEqual(sale_orders.mapped("fsm_recurring_count"), [1, 2, 0])
+        self.assertEqual(
+            self.sale_order_recur2.fsm_recurring_ids,
+            self.sale_line_recurring2.fsm_recurring_id
+            | self.sale_line_recurring3.fsm_recurring_id,
+        )
@@ -1,7 +1,10 @@
 # Copyright (C) 2018 - TODAY, Brian McMaster
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
-from odoo import api, fields, models
+from collections import defaultdict
+
+from odoo import Command, api, fields, models
+from odoo.osv import expression
 
 
 class FSMOrder(models.Model):
@@ -40,21 +43,47 @@ class FSMOrder(models.Model):
         string="Return Orders", compute="_compute_picking_ids"
     )
     move_ids = fields.One2many(
-        "stock.move", "fsm_order_id", string="Operations", domain=_get_move_domain
+        "stock.move", string="Operations", compute="_compute_move_ids"
     )
 
-    @api.depends("picking_ids")
+    @api.depends("picking_ids.picking_type_id")
     def _compute_picking_ids(self):
+        counts = defaultdict(int)
+        for order, picking_type, count in self.env["stock.picking"]._read_group(
+            [("fsm_order_id", "in", self._origin.ids)],
+            ["fsm_order_id", "picking_type_id"],
+            ["__count"],
+        ):
+            counts[(order.id, picking_type.code)] += count
         for order in self:
-            outgoing_pickings = order.picking_ids.filtered(
-                lambda p: p.picking_type_id.code == "outgoing"
-            )
-            order.delivery_count = len(outgoing_pickings.ids)
-            incoming_pickings = order.picking_ids.filtered(
-                lambda p: p.picking_type_id.code == "incoming"
+            order.delivery_count = counts[(order._origin.id, "outgoing")]
+            order.return_count = counts[(order._origin.id, "incoming")]
+
+    @api.depends("picking_ids.move_ids")
+    def _compute_move_ids(self):
+        """The operations of the orders, i.e. the moves of their transfers.
+        Only computed when the field is read, with a single search for all
+        the orders.
+        """
+        order_ids = self._origin.ids
+        moves = self.env["stock.move"].search(
+            expression.AND(
+                [
+                    self._get_move_domain(),
+                    [
+                        "|",
+                        ("picking_id.fsm_order_id", "in", order_ids),
+                        ("fsm_order_id", "in", order_ids),
+                    ],
+                ]
             )
-            order.return_count = len(incoming_pickings.ids)
-            order.move_ids = order.picking_ids.mapped("move_ids")
+        )
+        move_ids_by_order = defaultdict(list)
+        for move in moves:
+            order = move.picking_id.fsm_order_id or move.fsm_order_id
+            move_ids_by_order[order.id].append(move.id)
+        for order in self:
+            order.move_ids = [Command.set(move_ids_by_order[order._origin.id])]
 
     @api.onchange("person_id")
     def _onchange_person_id(self):
@@ -149,3 +149,61 @@ class TestFSMStockCommon(TransactionCase):
         order2.action_view_delivery()
         order3.action_view_returns()
         order.action_view_returns()
+
+    def test_fsm_orders_picking_counts(self):
+        """Test counters and operations computed for several orders at once."""
+        date_start = fields.Datetime.today()
+        orders = self.FSMOrder.create(
+            [
+                {
+                    "location_id": self.test_location.id,
+                    "date_start": date_start,
+                    "date_end": date_start + timedelta(hours=50),
+                    "request_early": date_start,
+                }
+                for _i in range(2)
+            ]
+        )
+        picking_type_in = self.env.ref("stock.picking_type_in")
+        picking_type_out = self.env.ref("stock.picking_type_out")
+        pickings = self.env["stock.picking"].create(
+            [
+                {
+                    "location_id": self.stock_location.id,
+                    "location_dest_id": self.customer_location.id,
+                    "picking_type_id": picking_type_out.id,
+                    "fsm_order_id": orders[0].id,
+                    "move_ids": [
+                        (
+                            0,
+                            0,
+                            {
+                                "name": self.Product.name,
+                                "product_id": self.Product.id,
+                                "product_uom": self.Product.uom_id.id,
+                                "product_uom_qty": 1,
+                                "location_id": self.stock_location.id,
+                                "location_dest_id": self.customer_location.id,
+                            },
+                        )
+                    ],
+                },
+                {
+                    "location_id": self.stock_location.id,
+                    "location_dest_id": self.customer_location.id,
+                    "picking_type_id": picking_type_out.id,
+                    "fsm_order_id": orders[0].id,
+                },
+                {
+                    "location_id": self.customer_location.id,
+                    "location_dest_id": self.stock_location.id,
+                    "picking_type_id": picking_type_in.id,
+                    "fsm_order_id": orders[1].id,
+                },
+            ]
+        )
+        orders.invalidate_recordset()
+        self.assertEqual(orders.mapped("delivery_count"), [2, 0])
+        self.assertEqual(orders.mapped("return_count"), [0, 1])
+        self.assertEqual(orders[0].move_ids, pickings[0].move_ids)
+        self.assertFalse(orders[1].move_ids)
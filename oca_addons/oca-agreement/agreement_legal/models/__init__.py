@@ -1,6 +1,7 @@
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
 from . import res_config_settings
+from . import agreement_render_mixin
 from . import agreement_stage
 from . import agreement
 from . import agreement_appendix
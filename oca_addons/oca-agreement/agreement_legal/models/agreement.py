@@ -3,13 +3,16 @@
 
 from datetime import timedelta
 
-from lxml import etree
-
 from odoo import _, api, fields, models
 
 
 class Agreement(models.Model):
-    _inherit = "agreement"
+    _name = "agreement"
+    _inherit = ["agreement", "agreement.render.mixin"]
+
+    # Number of days a missed review date is still alerted for, so that
+    # skipped cron runs are caught up.
+    _review_alert_catch_up_days = 7
 
     name = fields.Char(string="Title", required=True)
     version = fields.Integer(
@@ -264,6 +267,11 @@ class Agreement(models.Model):
         readonly=False,
         help="Date used to warn us some days before agreement expires",
     )
+    review_alert_date = fields.Date(
+        readonly=True,
+        copy=False,
+        help="Date the review of the agreement was last alerted",
+    )
 
     @api.depends("agreement_type_id", "end_date")
     def _compute_to_review_date(self):
@@ -274,53 +282,64 @@ class Agreement(models.Model):
                 )
 
     @api.model
-    def _alert_to_review_date(self):
-        agreements = self.search(
+    def _get_agreements_to_review(self):
+        """Agreements reaching their review date within the catch-up window
+        which were not alerted within it and have no activity scheduled."""
+        today = fields.Date.context_today(self)
+        catch_up_start = today - timedelta(days=self._review_alert_catch_up_days)
+        activities = self.env["mail.activity"]._search(
+            [("res_model", "=", self._name), ("res_id", "!=", False)]
+        )
+        return self.search(
             [
-                ("to_review_date", "=", fields.Date.today()),
+                ("to_review_date", ">=", catch_up_start),
+                ("to_review_date", "<=", today),
+                "|",
+                ("review_alert_date", "=", False),
+                ("review_alert_date", "<", catch_up_start),
                 ("agreement_type_id.review_user_id", "!=", False),
+                ("id", "not in", activities.subselect("res_id")),
             ]
         )
-        for agreement in agreements:
-            if (
-                self.env["mail.activity"].search_count(
-                    [("res_id", "=", agreement.id), ("res_model", "=", self._name)]
-                )
-                == 0
-            ):
-                agreement.activity_schedule(
-                    "agreement_legal.mail_activity_review_agreement",
-                    user_id=agreement.agreement_type_id.review_user_id.id,
-                    note=_("Your activity is going to end soon"),
-                )
+
+    @api.model
+    def _alert_to_review_date(self):
+        agreements = self._get_agreements_to_review()
+        agreements._set_review_alert_date(fields.Date.context_today(self))
+        for user, user_agreements in agreements.grouped(
+            lambda agreement: agreement.agreement_type_id.review_user_id
+        ).items():
+            user_agreements.activity_schedule(
+                "agreement_legal.mail_activity_review_agreement",
+                user_id=user.id,
+                note=_("Your activity is going to end soon"),
+            )
+
+    def _set_review_alert_date(self, alert_date):
+        """Store the review alert date with a single UPDATE, bypassing
+        ``write`` which would bump the revision of the agreements."""
+        if not self:
+            return
+        self.env.cr.execute(
+            "UPDATE agreement SET review_alert_date = %s WHERE id IN %s",
+            [alert_date, tuple(self.ids)],
+        )
+        self.invalidate_recordset(["review_alert_date"])
+        self.modified(["review_alert_date"])
+
+    def _get_render_lang(self):
+        self.ensure_one()
+        return self.partner_id.lang or "en_US"
 
     # compute the dynamic content for jinja expression
     def _compute_dynamic_description(self):
-        MailTemplates = self.env["mail.template"]
-        for agreement in self:
-            lang = agreement.partner_id.lang or "en_US"
-            description = MailTemplates.with_context(lang=lang)._render_template(
-                agreement.description, "agreement", [agreement.id]
-            )[agreement.id]
-            agreement.dynamic_description = description
+        self._render_dynamic_field("description", "dynamic_description")
 
     def _compute_dynamic_parties(self):
-        MailTemplates = self.env["mail.template"]
-        for agreement in self:
-            lang = agreement.partner_id.lang or "en_US"
-            parties = MailTemplates.with_context(lang=lang)._render_template(
-                agreement.parties, "agreement", [agreement.id]
-            )[agreement.id]
-            agreement.dynamic_parties = parties
+        self._render_dynamic_field("parties", "dynamic_parties")
 
     def _compute_dynamic_special_terms(self):
-        MailTemplates = self.env["mail.template"]
-        for agreement in self:
-            lang = agreement.partner_id.lang or "en_US"
-            special_terms = MailTemplates.with_context(lang=lang)._render_template(
-                agreement.special_terms, "agreement", [agreement.id]
-            )[agreement.id]
-            agreement.dynamic_special_terms = special_terms
+        self._render_dynamic_field("special_terms", "dynamic_special_terms")
 
     @api.onchange("field_id", "sub_model_object_field_id", "default_value")
     def onchange_copyvalue(self):
@@ -438,17 +457,24 @@ class Agreement(models.Model):
 
     # Increments the revision on each save action
     def write(self, vals):
-        res = True
-        for rec in self:
-            has_revision = False
-            if "revision" not in vals:
-                vals["revision"] = rec.revision + 1
-                has_revision = True
-            res = super(Agreement, rec).write(vals)
-            if has_revision:
-                vals.pop("revision")
+        if "revision" in vals:
+            return super().write(vals)
+        res = super().write(vals)
+        self._increment_revision()
         return res
 
+    def _increment_revision(self):
+        """Bump the revision of all the records with a single UPDATE."""
+        if not self:
+            return
+        self.flush_recordset(["revision"])
+        self.env.cr.execute(
+            "UPDATE agreement SET revision = revision + 1 WHERE id IN %s",
+            [tuple(self.ids)],
+        )
+        self.invalidate_recordset(["revision"])
+        self.modified(["revision"])
+
     def copy(self, default=None):
         """Assign a value for code is New"""
         default = dict(default or {})
@@ -465,18 +491,20 @@ class Agreement(models.Model):
         return "bool(readonly)"
 
     @api.model
-    def get_view(self, view_id=None, view_type=False, **options):
-        res = super().get_view(view_id, view_type, **options)
+    def _get_view(self, view_id=None, view_type="form", **options):
+        # Rewritten here rather than in get_view() so that the result is
+        # kept in the views cache along with the rest of the arch.
+        arch, view = super()._get_view(view_id, view_type, **options)
         # Readonly fields
         if view_type == "form":
-            doc = etree.XML(res["arch"])
-            for node in doc.xpath("//field[@name][not(ancestor::field)]"):
-                if node.attrib.get("name") in self._exclude_readonly_field():
+            exclude_fields = self._exclude_readonly_field()
+            readonly_domain = self._get_agreement_readonly_domain()
+            for node in arch.xpath("//field[@name][not(ancestor::field)]"):
+                if node.attrib.get("name") in exclude_fields:
                     continue
-                new_r_modifier = self._get_agreement_readonly_domain()
+                new_r_modifier = readonly_domain
                 old_r_modifier = node.attrib.get("readonly")
                 if old_r_modifier:
                     new_r_modifier = f"({old_r_modifier}) or ({new_r_modifier})"
                 node.attrib["readonly"] = new_r_modifier
-            res["arch"] = etree.tostring(doc)
-        return res
+        return arch, view
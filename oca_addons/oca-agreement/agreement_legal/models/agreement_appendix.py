@@ -6,6 +6,7 @@ from odoo import api, fields, models
 
 class AgreementAppendix(models.Model):
     _name = "agreement.appendix"
+    _inherit = "agreement.render.mixin"
     _description = "Agreement Appendices"
     _order = "sequence"
 
@@ -82,14 +83,4 @@ class AgreementAppendix(models.Model):
 
     # compute the dynamic content for jinja expression
     def _compute_dynamic_content(self):
-        MailTemplates = self.env["mail.template"]
-        for appendix in self:
-            lang = (
-                appendix.agreement_id
-                and appendix.agreement_id.partner_id.lang
-                or "en_US"
-            )
-            content = MailTemplates.with_context(lang=lang)._render_template(
-                appendix.content, "agreement.appendix", [appendix.id]
-            )[appendix.id]
-            appendix.dynamic_content = content
+        self._render_dynamic_field("content", "dynamic_content")
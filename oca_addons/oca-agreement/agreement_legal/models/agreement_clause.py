@@ -6,6 +6,7 @@ from odoo import api, fields, models
 
 class AgreementClause(models.Model):
     _name = "agreement.clause"
+    _inherit = "agreement.render.mixin"
     _description = "Agreement Clauses"
     _order = "sequence"
 
@@ -86,12 +87,4 @@ class AgreementClause(models.Model):
 
     # compute the dynamic content for jinja expression
     def _compute_dynamic_content(self):
-        MailTemplates = self.env["mail.template"]
-        for clause in self:
-            lang = (
-                clause.agreement_id and clause.agreement_id.partner_id.lang or "en_US"
-            )
-            content = MailTemplates.with_context(lang=lang)._render_template(
-                clause.content, "agreement.clause", [clause.id]
-            )[clause.id]
-            clause.dynamic_content = content
+        self._render_dynamic_field("content", "dynamic_content")
@@ -6,6 +6,7 @@ from odoo import api, fields, models
 
 class AgreementRecital(models.Model):
     _name = "agreement.recital"
+    _inherit = "agreement.render.mixin"
     _description = "Agreement Recitals"
     _order = "sequence"
 
@@ -80,12 +81,4 @@ class AgreementRecital(models.Model):
 
     # compute the dynamic content for jinja expression
     def _compute_dynamic_content(self):
-        MailTemplates = self.env["mail.template"]
-        for recital in self:
-            lang = (
-                recital.agreement_id and recital.agreement_id.partner_id.lang or "en_US"
-            )
-            content = MailTemplates.with_context(lang=lang)._render_template(
-                recital.content, "agreement.recital", [recital.id]
-            )[recital.id]
-            recital.dynamic_content = content
+        self._render_dynamic_field("content", "dynamic_content")
@@ -0,0 +1,64 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+import hashlib
+from collections import defaultdict
+
+from odoo import models, tools
+from odoo.tools.rendering_tools import parse_inline_template
+
+
+class AgreementRenderMixin(models.AbstractModel):
+    _name = "agreement.render.mixin"
+    _description = "Agreement Dynamic Content Rendering"
+
+    def _get_render_lang(self):
+        """Language used to render the dynamic content of the record."""
+        self.ensure_one()
+        agreement = self.agreement_id
+        return agreement and agreement.partner_id.lang or "en_US"
+
+    @tools.ormcache("source_hash")
+    def _get_template_static_value(self, source_hash, source):
+        """Return the rendered value of a template without placeholders,
+        or None when the template is dynamic. Only whether the source is
+        static is cached, on its hash: dynamic sources are still parsed and
+        rendered by ``_render_template``.
+        """
+        instructions = parse_inline_template(str(source))
+        if len(instructions) > 1 or instructions[0][1]:
+            return None
+        return instructions[0][0]
+
+    def _render_dynamic_field(self, source_fname, dest_fname):
+        """Render ``source_fname`` of the records into ``dest_fname``.
+
+        Records sharing the same language and template source are rendered
+        with a single ``_render_template`` call; sources without any
+        placeholder are not rendered at all.
+
+        The computes calling it declare no dependencies, as the fields read
+        by a template are not known.
+        """
+        groups = defaultdict(list)
+        for record in self:
+            groups[(record._get_render_lang(), record[source_fname] or "")].append(
+                record
+            )
+        MailTemplates = self.env["mail.template"]
+        for (lang, source), records in groups.items():
+            if not source:
+                for record in records:
+                    record[dest_fname] = source
+                continue
+            source_hash = hashlib.sha1(str(source).encode()).hexdigest()
+            static_value = self._get_template_static_value(source_hash, source)
+            if static_value is not None:
+                for record in records:
+                    record[dest_fname] = static_value
+                continue
+            res_ids = [record.id for record in records]
+            rendered = MailTemplates.with_context(lang=lang)._render_template(
+                source, self._name, res_ids
+            )
+            for record in records:
+                record[dest_fname] = rendered[record.id]
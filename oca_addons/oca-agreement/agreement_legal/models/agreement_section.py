@@ -6,6 +6,7 @@ from odoo import api, fields, models
 
 class AgreementSection(models.Model):
     _name = "agreement.section"
+    _inherit = "agreement.render.mixin"
     _description = "Agreement Sections"
     _order = "sequence"
 
@@ -83,12 +84,4 @@ class AgreementSection(models.Model):
 
     # compute the dynamic content for jinja expression
     def _compute_dynamic_content(self):
-        MailTemplates = self.env["mail.template"]
-        for section in self:
-            lang = (
-                section.agreement_id and section.agreement_id.partner_id.lang or "en_US"
-            )
-            content = MailTemplates.with_context(lang=lang)._render_template(
-                section.content, "agreement.section", [section.id]
-            )[section.id]
-            section.dynamic_content = content
+        self._render_dynamic_field("content", "dynamic_content")
@@ -155,9 +155,48 @@ class TestAgreement(TransactionCase):
             )
         )
 
+    def test_cron_catch_up(self):
+        self.agreement_type.write(
+            {"review_user_id": self.env.user.id, "review_days": 0}
+        )
+        agreement_02 = self.test_agreement.copy({"name": "TestAgreement2"})
+        agreements = self.test_agreement | agreement_02
+        agreements.write({"agreement_type_id": self.agreement_type.id})
+        today = fields.Date.today()
+        self.test_agreement.to_review_date = today - timedelta(days=2)
+        agreement_02.to_review_date = today - timedelta(
+            days=agreements._review_alert_catch_up_days + 1
+        )
+        domain = [("res_model", "=", "agreement"), ("res_id", "in", agreements.ids)]
+        revision = self.test_agreement.revision
+        self.env["agreement"]._alert_to_review_date()
+        # Alerting is not a contractual change
+        self.assertEqual(self.test_agreement.revision, revision)
+        activities = self.env["mail.activity"].search(domain)
+        self.assertEqual(activities.mapped("res_id"), [self.test_agreement.id])
+        self.assertEqual(activities.user_id, self.env.user)
+        self.env["agreement"]._alert_to_review_date()
+        self.assertEqual(self.env["mail.activity"].search_count(domain), 1)
+        # Done activities are not alerted again within the catch-up window
+        activities.action_feedback()
+        self.assertFalse(self.env["mail.activity"].search_count(domain))
+        self.env["agreement"]._alert_to_review_date()
+        self.assertFalse(self.env["mail.activity"].search_count(domain))
+        self.assertEqual(self.test_agreement.review_alert_date, today)
+
     def test_partner_action(self):
         action = self.test_agreement.partner_id.action_open_agreement()
         self.assertIn(
             self.test_agreement, self.env[action["res_model"]].search(action["domain"])
         )
         self.assertEqual(1, self.test_agreement.partner_id.agreements_count)
+
+    def test_write_revision(self):
+        agreement_02 = self.test_agreement.copy({"name": "TestAgreement2"})
+        agreement_02.write({"revision": 5})
+        agreements = self.test_agreement | agreement_02
+        revision = self.test_agreement.revision
+        agreements.write({"special_terms": "Bulk"})
+        self.assertEqual(agreements.mapped("revision"), [revision + 1, 6])
+        agreements.write({"revision": 3})
+        self.assertEqual(agreements.mapped("revision"), [3, 3])
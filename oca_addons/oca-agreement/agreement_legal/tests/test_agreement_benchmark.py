@@ -0,0 +1,47 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+import logging
+import time
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged("-standard", "agreement_legal_benchmark")
+class TestAgreementBenchmark(TransactionCase):
+    """Timings on large volumes, run with
+    ``--test-tags agreement_legal_benchmark``."""
+
+    def test_write_10k_agreements(self):
+        agreements = self.env["agreement"].create(
+            [{"name": "Benchmark %s" % i} for i in range(10000)]
+        )
+        self.env.flush_all()
+        revisions = agreements.mapped("revision")
+        start = time.perf_counter()
+        agreements.write({"special_terms": "Benchmark"})
+        self.env.flush_all()
+        _logger.info(
+            "write on %s agreements done in %.2fs",
+            len(agreements),
+            time.perf_counter() - start,
+        )
+        self.assertEqual(
+            agreements.mapped("revision"), [revision + 1 for revision in revisions]
+        )
+
+    def test_get_view_cached(self):
+        Agreement = self.env["agreement"]
+        view_id = self.ref("agreement_legal.partner_agreement_form_view")
+        Agreement.get_view(view_id=view_id, view_type="form")
+        with patch.object(
+            type(Agreement), "_get_view", side_effect=AssertionError("cache miss")
+        ):
+            start = time.perf_counter()
+            for _i in range(1000):
+                Agreement.get_view(view_id=view_id, view_type="form")
+            _logger.info(
+                "1000 cached agreement form views fetched in %.2fs",
+                time.perf_counter() - start,
+            )
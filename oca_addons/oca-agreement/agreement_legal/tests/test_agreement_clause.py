@@ -1,6 +1,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html)
 
 from datetime import timedelta
+from unittest.mock import patch
 
 from odoo import fields
 from odoo.tests.common import TransactionCase
@@ -64,3 +65,29 @@ class TestAgreementClauses(TransactionCase):
         clause_01 = self.test_clause
         clause_01.content = "{{object.name}}"
         self.assertEqual(clause_01.dynamic_content, "<p>TestClause</p>")
+
+    # TEST 04: Dynamic content is rendered once per language and source
+    def test_compute_dynamic_content_batched(self):
+        clauses = self.test_clause | self.env["agreement.clause"].create(
+            [
+                {
+                    "name": "TestClause%s" % index,
+                    "content": "{{object.name}}",
+                    "agreement_id": self.test_agreement.id,
+                }
+                for index in range(3)
+            ]
+        )
+        self.test_clause.content = "Static"
+        MailTemplate = self.env.registry["mail.template"]
+        with patch.object(
+            MailTemplate,
+            "_render_template",
+            side_effect=MailTemplate._render_template,
+            autospec=True,
+        ) as render:
+            clauses.mapped("dynamic_content")
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(self.test_clause.dynamic_content, "<p>Static</p>")
+        self.assertEqual(clauses[1].dynamic_content, "<p>TestClause0</p>")
+        self.assertEqual(clauses[3].dynamic_content, "<p>TestClause2</p>")
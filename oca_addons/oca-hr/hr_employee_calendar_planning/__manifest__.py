@@ -2,7 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 {
     "name": "Employee Calendar Planning",
-    "version": "17.0.1.0.4",
+    "version": "17.0.1.2.0",
     "category": "Human Resources",
     "website": "https://github.com/OCA/hr",
     "author": "Tecnativa,Odoo Community Association (OCA)",
@@ -11,6 +11,7 @@
     "depends": ["hr"],
     "data": [
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/hr_employee_views.xml",
         "views/resource_calendar_views.xml",
     ],
@@ -0,0 +1,18 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+
+def migrate(cr, version):
+    """Fill the master -> generated calendars index."""
+    cr.execute(
+        """
+        INSERT INTO resource_calendar_planning_master_rel
+            (generated_calendar_id, master_calendar_id)
+        SELECT DISTINCT generated.id, planning.calendar_id
+        FROM hr_employee_calendar planning
+        JOIN hr_employee employee ON employee.id = planning.employee_id
+        JOIN resource_resource resource ON resource.id = employee.resource_id
+        JOIN resource_calendar generated ON generated.id = resource.calendar_id
+        WHERE generated.auto_generate
+        ON CONFLICT DO NOTHING
+        """
+    )
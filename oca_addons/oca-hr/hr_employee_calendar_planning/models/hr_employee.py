@@ -2,9 +2,19 @@
 # Copyright 2022-2023 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import _, api, fields, models
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from odoo import Command, _, api, fields, models
 from odoo.exceptions import UserError
-from odoo.tools import config
+from odoo.tools import config, split_every
+
+_logger = logging.getLogger(__name__)
+
+# Number of employees regenerated (and committed) at once by the mass job
+REGENERATE_CHUNK_SIZE = 200
 
 SECTION_LINES = [
     (
@@ -58,21 +68,37 @@ class HrEmployee(models.Model):
             ]
         return vals
 
-    def _regenerate_calendar(self):
+    def _get_calendar_planning_signature(self):
+        """Key identifying the calendar planning of the employee.
+
+        Employees sharing it get the same generated attendances and global
+        leaves, which are then only computed once.
+        """
         self.ensure_one()
+        return tuple(
+            (line.calendar_id.id, line.date_start, line.date_end)
+            for line in self.calendar_ids
+        )
+
+    def _prepare_calendar_attendances(self, attendance_data=None):
+        """Prepare the attendances of the generated calendar.
+
+        :param attendance_data: cache of the copied values of the master
+            calendars attendances, shared between employees
+        :returns: tuple -- (two weeks calendar, list of attendance values
+            without calendar_id)
+        """
+        self.ensure_one()
+        if attendance_data is None:
+            attendance_data = {}
         vals_list = []
         two_weeks = bool(
             self.calendar_ids.mapped("calendar_id").filtered("two_weeks_calendar")
         )
-        if self.resource_id.calendar_id.auto_generate:
-            self.resource_calendar_id.attendance_ids.unlink()
-            self.resource_calendar_id.two_weeks_calendar = two_weeks
         seq = 0
         for week in ["0", "1"] if two_weeks else ["0"]:
             if two_weeks:
-                section_vals = SECTION_LINES[int(week)]
-                section_vals[2]["sequence"] = seq
-                vals_list.append(section_vals)
+                vals_list.append(dict(SECTION_LINES[int(week)][2], sequence=seq))
                 seq += 1
             for line in self.calendar_ids:
                 if line.calendar_id.two_weeks_calendar:
@@ -84,19 +110,32 @@ class HrEmployee(models.Model):
                 for attendance_line in attendances:
                     if attendance_line.display_type == "line_section":
                         continue
-                    data = attendance_line.copy_data(
-                        {
-                            "calendar_id": self.resource_calendar_id.id,
-                            "date_from": line.date_start,
-                            "date_to": line.date_end,
-                            "week_type": week if two_weeks else False,
-                            "sequence": seq,
-                        }
-                    )[0]
+                    if attendance_line.id not in attendance_data:
+                        data = attendance_line.copy_data()[0]
+                        data.pop("calendar_id", None)
+                        attendance_data[attendance_line.id] = data
+                    vals_list.append(
+                        dict(
+                            attendance_data[attendance_line.id],
+                            date_from=line.date_start,
+                            date_to=line.date_end,
+                            week_type=week if two_weeks else False,
+                            sequence=seq,
+                        )
+                    )
                     seq += 1
-                    vals_list.append((0, 0, data))
-        # Autogenerate
-        if not self.resource_id.calendar_id.auto_generate:
+        return two_weeks, vals_list
+
+    def _regenerate_calendar(self):
+        self.ensure_one()
+        self.regenerate_calendar()
+
+    def _apply_generated_calendar(self, two_weeks, vals_list):
+        """Create the generated calendar of the employee, or update the
+        existing one by only changing the attendances that differ."""
+        self.ensure_one()
+        calendar = self.resource_id.calendar_id
+        if not calendar.auto_generate:
             self.resource_id.calendar_id = (
                 self.env["resource.calendar"]
                 .create(
@@ -106,24 +145,61 @@ class HrEmployee(models.Model):
                         "auto_generate": True,
                         "name": _("Auto generated calendar for employee")
                         + " %s" % self.name,
-                        "attendance_ids": vals_list,
+                        "attendance_ids": [Command.create(v) for v in vals_list],
                         "two_weeks_calendar": two_weeks,
                         "tz": self.tz,  # take employee timezone as default
                     }
                 )
                 .id
             )
-        else:
-            self.resource_calendar_id.attendance_ids = vals_list
-        # Set the hours per day to the last (top date end) calendar line to apply
-        if self.calendar_ids:
-            self.resource_id.calendar_id.hours_per_day = self.calendar_ids[
-                0
-            ].calendar_id.hours_per_day
+            return
+        calendar._update_attendances(vals_list, two_weeks)
+
+    def regenerate_calendar(self):
+        """Regenerate the calendars of the employees.
+
+        Attendances and global leaves are computed once per planning
+        signature, and only the rows that differ from the expected ones are
+        written on each generated calendar.
+        """
+        attendance_data = {}
+        attendances_by_signature = {}
+        leaves_by_signature = {}
+        leave_data = {}
+        leave_vals_list = []
+        leaves_to_unlink = self.env["resource.calendar.leaves"]
+        for employee in self:
+            signature = employee._get_calendar_planning_signature()
+            if signature not in attendances_by_signature:
+                attendances_by_signature[
+                    signature
+                ] = employee._prepare_calendar_attendances(attendance_data)
+            employee._apply_generated_calendar(*attendances_by_signature[signature])
+            # Keep the master -> generated calendars index up to date
+            calendar = employee.resource_id.calendar_id
+            masters = employee.calendar_ids.calendar_id
+            if calendar.planning_master_calendar_ids != masters:
+                calendar.planning_master_calendar_ids = [Command.set(masters.ids)]
+            # Set the hours per day to the last (top date end) calendar line to
+            # apply
+            if not employee.calendar_ids:
+                continue
+            hours_per_day = employee.calendar_ids[0].calendar_id.hours_per_day
+            if calendar.hours_per_day != hours_per_day:
+                calendar.hours_per_day = hours_per_day
             # set global leaves
-            self.copy_global_leaves()
+            if signature not in leaves_by_signature:
+                leaves_by_signature[signature] = employee._get_global_leaves_to_copy()
+            vals_list, to_unlink = employee._prepare_global_leaves_update(
+                leaves_by_signature[signature], leave_data
+            )
+            leave_vals_list += vals_list
+            leaves_to_unlink |= to_unlink
+        leaves_to_unlink.unlink()
+        return self.env["resource.calendar.leaves"].create(leave_vals_list)
 
-    def copy_global_leaves(self):
+    def _get_global_leaves_to_copy(self):
+        """Return the master calendars global leaves within the planning."""
         self.ensure_one()
         leave_ids = []
         for calendar in self.calendar_ids:
@@ -137,34 +213,98 @@ class HrEmployee(models.Model):
                     lambda x, c=calendar: x.date_from.date() <= c.date_end
                 )
             leave_ids += global_leaves.ids
-        vals = [
-            leave.copy_data({"calendar_id": self.resource_id.calendar_id.id})[0]
-            for leave in self.env["resource.calendar.leaves"].search(
-                [("id", "in", leave_ids)], order="date_from asc"
-            )
-        ]
-        existing_leaves_mapping = {
-            e.date_from: e for e in self.resource_id.calendar_id.global_leave_ids
-        }
-        requested_create_dates = [(e.get("date_from"), e.get("date_to")) for e in vals]
-        new_vals = [
-            v
-            for v in vals
-            if not (
-                v.get("date_from") in existing_leaves_mapping
-                and v.get("date_to")
-                == existing_leaves_mapping[v.get("date_from")].date_to
-            )
-        ]
-        to_unlink = self.resource_id.calendar_id.global_leave_ids.filtered(
+        return self.env["resource.calendar.leaves"].search(
+            [("id", "in", leave_ids)], order="date_from asc"
+        )
+
+    def _prepare_global_leaves_update(self, global_leaves, leave_data=None):
+        """Diff the global leaves of the generated calendar with the expected
+        ones.
+
+        :param leave_data: cache of the copied values of the leaves, shared
+            between employees
+        :returns: tuple -- (values of the leaves to create, leaves to unlink)
+        """
+        self.ensure_one()
+        if leave_data is None:
+            leave_data = {}
+        calendar = self.resource_id.calendar_id
+        existing_leaves_mapping = {e.date_from: e for e in calendar.global_leave_ids}
+        requested_create_dates = [(e.date_from, e.date_to) for e in global_leaves]
+        vals_list = []
+        for leave in global_leaves:
+            existing = existing_leaves_mapping.get(leave.date_from)
+            if existing and existing.date_to == leave.date_to:
+                continue
+            if leave.id not in leave_data:
+                leave_data[leave.id] = leave.copy_data()[0]
+            vals_list.append(dict(leave_data[leave.id], calendar_id=calendar.id))
+        to_unlink = calendar.global_leave_ids.filtered(
             lambda x: (x.date_from, x.date_to) not in requested_create_dates
         )
+        return vals_list, to_unlink
+
+    def copy_global_leaves(self):
+        self.ensure_one()
+        vals_list, to_unlink = self._prepare_global_leaves_update(
+            self._get_global_leaves_to_copy()
+        )
         to_unlink.unlink()
-        return self.env["resource.calendar.leaves"].create(new_vals).ids
+        return self.env["resource.calendar.leaves"].create(vals_list).ids
 
-    def regenerate_calendar(self):
-        for item in self:
-            item._regenerate_calendar()
+    @api.model
+    def _regenerate_all_calendars(self, chunk_size=REGENERATE_CHUNK_SIZE):
+        """Regenerate the calendars of all the employees with a planning,
+        committing after each chunk."""
+        employees = (
+            self.with_context(active_test=False)
+            .search([("calendar_ids", "!=", False)])
+            .sudo()
+        )
+        return employees._regenerate_calendar_batches(chunk_size=chunk_size)
+
+    def _regenerate_calendar_batches(self, chunk_size=REGENERATE_CHUNK_SIZE):
+        """Regenerate the calendars by chunks of employees sharing the same
+        planning signature, committing after each chunk.
+
+        :returns: list of dict -- metrics of each batch
+        """
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        by_signature = defaultdict(list)
+        for employee in self:
+            by_signature[employee._get_calendar_planning_signature()].append(
+                employee.id
+            )
+        ordered_ids = [
+            employee_id for ids in by_signature.values() for employee_id in ids
+        ]
+        metrics = []
+        done = 0
+        for chunk in split_every(chunk_size, ordered_ids, self.browse):
+            start = time.perf_counter()
+            chunk.regenerate_calendar()
+            chunk.env.flush_all()
+            done += len(chunk)
+            batch_metrics = {
+                "employees": len(chunk),
+                "signatures": len(
+                    {e._get_calendar_planning_signature() for e in chunk}
+                ),
+                "duration": time.perf_counter() - start,
+            }
+            metrics.append(batch_metrics)
+            _logger.info(
+                "Regenerated calendars: %s/%s (batch of %s employees, "
+                "%s plannings, %.2fs)",
+                done,
+                len(ordered_ids),
+                batch_metrics["employees"],
+                batch_metrics["signatures"],
+                batch_metrics["duration"],
+            )
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+        return metrics
 
     def copy(self, default=None):
         self.ensure_one()
@@ -185,8 +325,7 @@ class HrEmployee(models.Model):
             and res.filtered(lambda x: not x.calendar_ids)
         ):
             raise UserError(_("You can not create employees without any calendar."))
-        for employee in res.filtered("calendar_ids"):
-            employee.sudo().regenerate_calendar()
+        res.filtered("calendar_ids").sudo().regenerate_calendar()
         return res
 
 
@@ -224,19 +363,16 @@ class HrEmployeeCalendar(models.Model):
     @api.model_create_multi
     def create(self, vals):
         calendars = super().create(vals)
-        for calendar in calendars:
-            calendar.employee_id.sudo()._regenerate_calendar()
+        calendars.mapped("employee_id").sudo().regenerate_calendar()
         return calendars
 
     def write(self, vals):
         res = super().write(vals)
-        for employee in self.mapped("employee_id"):
-            employee._regenerate_calendar()
+        self.mapped("employee_id").regenerate_calendar()
         return res
 
     def unlink(self):
         employees = self.mapped("employee_id")
         res = super().unlink()
-        for employee in employees:
-            employee._regenerate_calendar()
+        employees.regenerate_calendar()
         return res
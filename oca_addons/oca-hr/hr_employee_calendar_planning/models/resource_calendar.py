@@ -2,16 +2,52 @@
 # Copyright 2021 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import _, api, fields, models
+from collections import defaultdict
+
+from odoo import Command, _, api, fields, models
 from odoo.exceptions import ValidationError
 
 
+def _normalize_value(value):
+    """Comparable form of a field value, as read or as written."""
+    if isinstance(value, list | tuple):
+        ids = set()
+        for item in value:
+            if isinstance(item, list | tuple):
+                # x2many commands: only "set" is produced by copy_data
+                ids.update(item[2] if item[0] == Command.SET else [])
+            else:
+                ids.add(item)
+        return tuple(sorted(ids))
+    return value
+
+
 class ResourceCalendar(models.Model):
     _inherit = "resource.calendar"
 
     active = fields.Boolean(default=True)
     auto_generate = fields.Boolean()
     employee_calendar_ids = fields.One2many("hr.employee.calendar", "calendar_id")
+    # Index of the master calendars a generated calendar is composed of
+    planning_master_calendar_ids = fields.Many2many(
+        comodel_name="resource.calendar",
+        relation="resource_calendar_planning_master_rel",
+        column1="generated_calendar_id",
+        column2="master_calendar_id",
+        string="Planning Master Calendars",
+        readonly=True,
+        copy=False,
+    )
+    planning_propagation_pending = fields.Boolean(
+        readonly=True,
+        copy=False,
+        help="Changes of this calendar are being propagated in background "
+        "to the calendars generated from it.",
+    )
+
+    # Above this number of dependent employees, changes of a master calendar
+    # are propagated by a background job
+    _planning_propagation_threshold = 100
 
     @api.constrains("active")
     def _check_active(self):
@@ -58,10 +94,98 @@ class ResourceCalendar(models.Model):
     def write(self, vals):
         res = super().write(vals)
         if "attendance_ids" in vals or "global_leave_ids" in vals:
-            for record in self.filtered(lambda x: not x.auto_generate):
-                calendars = self.env["hr.employee.calendar"].search(
-                    [("calendar_id", "=", record.id)]
-                )
-                for employee in calendars.mapped("employee_id"):
-                    employee._regenerate_calendar()
+            self.filtered(lambda x: not x.auto_generate)._propagate_planning()
         return res
+
+    def _get_planning_dependent_employees(self):
+        """Return the employees whose generated calendar uses these ones."""
+        if not self:
+            return self.env["hr.employee"]
+        generated = self.with_context(active_test=False).search(
+            [("planning_master_calendar_ids", "in", self.ids)]
+        )
+        return (
+            self.env["hr.employee"]
+            .with_context(active_test=False)
+            .search([("resource_calendar_id", "in", generated.ids)])
+        )
+
+    def _propagate_planning(self):
+        """Regenerate the calendars depending on these master calendars,
+        in background when there are many of them."""
+        employees = self._get_planning_dependent_employees()
+        if len(employees) > self._planning_propagation_threshold:
+            self.planning_propagation_pending = True
+            self.env.ref(
+                "hr_employee_calendar_planning.ir_cron_propagate_planning"
+            )._trigger()
+        else:
+            employees.regenerate_calendar()
+
+    @api.model
+    def _cron_propagate_planning(self):
+        """Regenerate the dependents of the modified master calendars,
+        grouped by planning signature.
+
+        :returns: list of dict -- metrics of each batch
+        """
+        masters = self.with_context(active_test=False).search(
+            [("planning_propagation_pending", "=", True)]
+        )
+        if not masters:
+            return []
+        # Masters modified while the batches run stay pending for next run
+        write_dates = {master.id: master.write_date for master in masters}
+        employees = masters._get_planning_dependent_employees()
+        metrics = employees.sudo()._regenerate_calendar_batches()
+        masters.invalidate_recordset(["write_date"])
+        masters.filtered(
+            lambda master: master.write_date == write_dates[master.id]
+        ).planning_propagation_pending = False
+        return metrics
+
+    def _update_attendances(self, vals_list, two_weeks):
+        """Make the attendances match ``vals_list`` by only creating,
+        deleting or resequencing the rows that differ.
+
+        :param vals_list: list of attendance values, without calendar_id
+        """
+        self.ensure_one()
+        attendances = self.attendance_ids
+        key_fnames = {tuple(sorted(set(vals) - {"sequence"})) for vals in vals_list}
+        read_fnames = sorted({fname for fnames in key_fnames for fname in fnames})
+        existing_by_key = defaultdict(list)
+        if read_fnames:
+            for data in attendances.read(read_fnames, load=False):
+                for fnames in key_fnames:
+                    key = (fnames, tuple(_normalize_value(data[f]) for f in fnames))
+                    existing_by_key[key].append(data["id"])
+        kept_ids = set()
+        commands = []
+        for vals in vals_list:
+            fnames = tuple(sorted(set(vals) - {"sequence"}))
+            key = (fnames, tuple(_normalize_value(vals[f]) for f in fnames))
+            candidates = existing_by_key[key]
+            while candidates and candidates[0] in kept_ids:
+                candidates.pop(0)
+            if not candidates:
+                commands.append(Command.create(vals))
+                continue
+            attendance = attendances.browse(candidates.pop(0))
+            kept_ids.add(attendance.id)
+            if attendance.sequence != int(vals.get("sequence", 0)):
+                commands.append(
+                    Command.update(attendance.id, {"sequence": vals["sequence"]})
+                )
+        commands = [
+            Command.delete(attendance_id)
+            for attendance_id in attendances.ids
+            if attendance_id not in kept_ids
+        ] + commands
+        vals = {}
+        if commands:
+            vals["attendance_ids"] = commands
+        if self.two_weeks_calendar != two_weeks:
+            vals["two_weeks_calendar"] = two_weeks
+        if vals:
+            self.write(vals)
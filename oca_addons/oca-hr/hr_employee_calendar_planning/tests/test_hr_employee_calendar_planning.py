@@ -2,6 +2,8 @@
 # Copyright 2021-2023 Tecnativa - Víctor Martínez
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from unittest.mock import patch
+
 from odoo import exceptions, fields
 from odoo.tests import common, new_test_user
 
@@ -477,3 +479,132 @@ class TestHrEmployeeCalendarPlanning(common.TransactionCase):
             ]
         )
         self.assertEqual(len(employees), 2)
+
+    def test_calendar_regeneration_diff(self):
+        self.employee.calendar_ids = [
+            (0, 0, {"date_end": "2019-12-31", "calendar_id": self.calendar1.id}),
+            (0, 0, {"date_start": "2020-01-01", "calendar_id": self.calendar2.id}),
+        ]
+        calendar = self.employee.resource_calendar_id
+        attendances = calendar.attendance_ids
+        leaves = calendar.global_leave_ids
+        # Regenerating an unchanged planning keeps the existing rows
+        self.employee.regenerate_calendar()
+        self.assertEqual(calendar.attendance_ids, attendances)
+        self.assertEqual(calendar.global_leave_ids, leaves)
+        # Only the rows of the changed line are replaced
+        self.employee.calendar_ids.filtered("date_start").date_start = "2020-01-02"
+        self.assertEqual(len(calendar.attendance_ids), 15)
+        self.assertEqual(len(calendar.attendance_ids & attendances), 10)
+
+    def test_regenerate_calendar_multi(self):
+        employees = self.env["hr.employee"].create(
+            [
+                {
+                    "name": "Planning employee %s" % i,
+                    "calendar_ids": [
+                        (0, 0, {"date_end": "2019-12-31", "calendar_id": cal.id}),
+                        (
+                            0,
+                            0,
+                            {"date_start": "2020-01-01", "calendar_id": cal2.id},
+                        ),
+                    ],
+                }
+                for i, (cal, cal2) in enumerate(
+                    [
+                        (self.calendar1, self.calendar2),
+                        (self.calendar1, self.calendar2),
+                        (self.calendar2, self.calendar1),
+                    ]
+                )
+            ]
+        )
+        calendars = employees.mapped("resource_calendar_id")
+        self.assertEqual(len(calendars), 3)
+        self.assertEqual(calendars.mapped("auto_generate"), [True] * 3)
+        self.assertEqual(len(calendars[0].attendance_ids), 15)
+        self.assertEqual(len(calendars[2].attendance_ids), 15)
+        self.assertEqual(
+            calendars[0].global_leave_ids.mapped("name"),
+            calendars[1].global_leave_ids.mapped("name"),
+        )
+        # Mass regeneration job
+        calendars.attendance_ids.unlink()
+        self.env["hr.employee"]._regenerate_all_calendars(chunk_size=2)
+        self.assertEqual(len(calendars[1].attendance_ids), 15)
+
+    def test_master_calendar_propagation(self):
+        self.employee.calendar_ids = [
+            (0, 0, {"date_end": "2019-12-31", "calendar_id": self.calendar1.id}),
+            (0, 0, {"date_start": "2020-01-01", "calendar_id": self.calendar2.id}),
+        ]
+        calendar = self.employee.resource_calendar_id
+        self.assertEqual(
+            calendar.planning_master_calendar_ids, self.calendar1 | self.calendar2
+        )
+        self.assertEqual(
+            self.calendar2._get_planning_dependent_employees(), self.employee
+        )
+        new_attendance = {
+            "name": "Attendance",
+            "dayofweek": "6",
+            "hour_from": "08",
+            "hour_to": "12",
+        }
+        # Propagated in background above the threshold
+        self.patch(type(self.calendar2), "_planning_propagation_threshold", 0)
+        self.calendar2.write({"attendance_ids": [(0, 0, new_attendance)]})
+        self.assertTrue(self.calendar2.planning_propagation_pending)
+        self.assertEqual(len(calendar.attendance_ids), 15)
+        metrics = self.env["resource.calendar"]._cron_propagate_planning()
+        self.assertEqual(len(calendar.attendance_ids), 16)
+        self.assertFalse(self.calendar2.planning_propagation_pending)
+        self.assertEqual(metrics[0]["employees"], 1)
+        self.assertEqual(metrics[0]["signatures"], 1)
+
+    def test_master_calendar_propagation_concurrent_change(self):
+        self.employee.calendar_ids = [
+            (0, 0, {"date_end": "2019-12-31", "calendar_id": self.calendar1.id}),
+            (0, 0, {"date_start": "2020-01-01", "calendar_id": self.calendar2.id}),
+        ]
+        self.patch(type(self.calendar2), "_planning_propagation_threshold", 0)
+        self.calendar2.write(
+            {
+                "attendance_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": "Attendance",
+                            "dayofweek": "6",
+                            "hour_from": "08",
+                            "hour_to": "12",
+                        },
+                    )
+                ]
+            }
+        )
+        employee_model = self.env.registry["hr.employee"]
+        regenerate = employee_model._regenerate_calendar_batches
+
+        def regenerate_and_modify_master(employees, *args, **kwargs):
+            res = regenerate(employees, *args, **kwargs)
+            # The master is modified by another transaction meanwhile
+            self.env.cr.execute(
+                "UPDATE resource_calendar "
+                "SET write_date = write_date + interval '1 second' WHERE id = %s",
+                [self.calendar2.id],
+            )
+            return res
+
+        with patch.object(
+            employee_model,
+            "_regenerate_calendar_batches",
+            side_effect=regenerate_and_modify_master,
+            autospec=True,
+        ):
+            self.env["resource.calendar"]._cron_propagate_planning()
+        self.assertTrue(self.calendar2.planning_propagation_pending)
+        self.env["resource.calendar"]._cron_propagate_planning()
+        self.assertFalse(self.calendar2.planning_propagation_pending)
@@ -6,11 +6,11 @@
     "summary": """
         Adds sequence to maintenance equipment defined in the equipment's
         category""",
-    "version": "17.0.1.0.1",
+    "version": "17.0.1.1.0",
     "license": "AGPL-3",
     "author": "ForgeFlow S.L.," "Odoo Community Association (OCA)",
     "maintainers": ["AdriaGForgeFlow"],
     "website": "https://github.com/OCA/maintenance",
     "depends": ["maintenance"],
-    "data": ["views/maintenance_views.xml"],
+    "data": ["data/ir_cron.xml", "views/maintenance_views.xml"],
 }
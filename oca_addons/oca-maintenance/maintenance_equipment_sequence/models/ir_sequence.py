@@ -0,0 +1,32 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+
+from odoo import models
+
+from odoo.addons.base.models.ir_sequence import _update_nogap
+
+
+class IrSequence(models.Model):
+    _inherit = "ir.sequence"
+
+    def _reserve_next(self, count):
+        """Reserve ``count`` values of the sequence at once.
+
+        Sequences using date ranges fall back to one ``_next()`` per value.
+
+        :returns: list of the interpolated values, in sequence order
+        """
+        self.ensure_one()
+        if count <= 0:
+            return []
+        if self.use_date_range:
+            return [self._next() for _i in range(count)]
+        if self.implementation == "standard":
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ("ir_sequence_%03d" % self.id, count),
+            )
+            numbers = [row[0] for row in self.env.cr.fetchall()]
+        else:
+            number_next = _update_nogap(self, self.number_increment * count)
+            numbers = [number_next + i * self.number_increment for i in range(count)]
+        return [self.get_next_char(number) for number in numbers]
@@ -1,7 +1,16 @@
 # Copyright 2021 ForgeFlow S.L. (https://forgeflow.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+import logging
+import threading
+
 from odoo import api, fields, models
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Number of equipment codes reserved and written at once
+EQUIPMENT_CODE_CHUNK_SIZE = 1000
 
 
 class MaintenanceEquipmentCategory(models.Model):
@@ -23,6 +32,17 @@ class MaintenanceEquipmentCategory(models.Model):
         compute="_compute_seq_number_next",
         inverse="_inverse_seq_number_next",
     )
+    equipment_code_pending = fields.Boolean(
+        string="Equipment Codes Pending",
+        readonly=True,
+        copy=False,
+        help="The codes of the equipments of this category are being "
+        "assigned in background.",
+    )
+
+    # Above this number of equipments to number, codes are assigned by a
+    # background job instead of synchronously
+    _equipment_code_async_threshold = 5000
 
     @api.model
     def _create_sequence(self, vals):
@@ -94,35 +114,94 @@ class MaintenanceEquipmentCategory(models.Model):
             self.sequence_prefix = self.sequence_id.prefix
 
     def _compute_equipment_code(self):
-        for category in self:
-            if category.sequence_id:
-                category_equipments = category.env["maintenance.equipment"].search(
-                    [("category_id", "=", category.id)]
+        for category in self.filtered(
+            lambda c: c.sequence_id and not c.equipment_code_pending
+        ):
+            equipments = category._get_equipments_without_code()
+            if len(equipments) > self._equipment_code_async_threshold:
+                category.equipment_code_pending = True
+                self.env.ref(
+                    "maintenance_equipment_sequence.ir_cron_assign_equipment_code"
+                )._trigger()
+            else:
+                equipments._assign_serial_no()
+
+    def _get_equipments_without_code(self):
+        self.ensure_one()
+        return self.env["maintenance.equipment"].search(
+            [("category_id", "=", self.id), ("serial_no", "=", False)], order="id"
+        )
+
+    @api.model
+    def _cron_assign_equipment_code(self):
+        """Assign the pending equipment codes, committing after each chunk."""
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        for category in self.search([("equipment_code_pending", "=", True)]):
+            equipments = category._get_equipments_without_code()
+            done = 0
+            for chunk in split_every(
+                EQUIPMENT_CODE_CHUNK_SIZE, equipments.ids, equipments.browse
+            ):
+                chunk._assign_serial_no()
+                done += len(chunk)
+                _logger.info(
+                    "Equipment codes of category %s: %s/%s assigned",
+                    category.display_name,
+                    done,
+                    len(equipments),
                 )
-                for equipment in category_equipments:
-                    if not equipment.serial_no and equipment.category_id.sequence_id:
-                        equipment.serial_no = equipment.category_id.sequence_id._next()
+                if auto_commit:
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+            category.equipment_code_pending = False
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
 
 
 class MaintenanceEquipment(models.Model):
     _inherit = "maintenance.equipment"
 
-    @api.model
-    def create(self, vals):
-        equipment = super().create(vals)
-        if equipment.category_id and not equipment.serial_no:
-            sequence_id = (
-                self.env["maintenance.equipment.category"]
-                .browse(vals["category_id"])
-                .sequence_id
-            )
-            if sequence_id:
-                equipment.serial_no = sequence_id._next()
-        return equipment
+    @api.model_create_multi
+    def create(self, vals_list):
+        equipments = super().create(vals_list)
+        equipments._assign_serial_no()
+        return equipments
 
     def write(self, vals):
         result = super().write(vals)
-        for rec in self:
-            if rec.category_id and not rec.serial_no and rec.category_id.sequence_id:
-                rec.serial_no = rec.category_id.sequence_id._next()
+        self._assign_serial_no()
         return result
+
+    def _assign_serial_no(self):
+        """Number the equipments without serial number from their category
+        sequence, reserving the numbers of each sequence at once."""
+        to_number = self.filtered(
+            lambda rec: rec.category_id.sequence_id and not rec.serial_no
+        )
+        for sequence, equipments in to_number.grouped(
+            lambda rec: rec.category_id.sequence_id
+        ).items():
+            codes = sequence._reserve_next(len(equipments))
+            equipments._write_serial_no(dict(zip(equipments.ids, codes, strict=True)))
+
+    def _write_serial_no(self, codes):
+        """Write serial numbers with a single UPDATE query.
+
+        :param codes: dict -- {equipment id: serial number}
+        """
+        if not codes:
+            return
+        self.flush_model(["serial_no"])
+        self.env.cr.execute(
+            """
+            UPDATE maintenance_equipment equipment
+            SET serial_no = codes.serial_no,
+                write_uid = %s,
+                write_date = (now() at time zone 'UTC')
+            FROM unnest(%s::int[], %s::varchar[]) AS codes(id, serial_no)
+            WHERE equipment.id = codes.id
+            """,
+            (self.env.uid, list(codes), list(codes.values())),
+        )
+        equipments = self.browse(codes)
+        equipments.invalidate_recordset(["serial_no", "write_uid", "write_date"])
+        equipments.modified(["serial_no"])
@@ -166,3 +166,33 @@ class TestMaintenanceEquipmentSequence(TransactionCase):
 
         equipment_03.write({"category_id": cat_01.id})
         self.assertEqual(equipment_03.serial_no, "TST003")
+
+    def test_05_bulk_equipment_code(self):
+        """Numbers are reserved at once for many equipments, or by the
+        background job above the threshold"""
+        category = self.maintenance_equipment_categ_obj.create(
+            {"name": "Bulk Category"}
+        )
+        equipments = self.maintenance_equipment_obj.create(
+            [{"name": "Bulk %s" % i, "category_id": category.id} for i in range(5)]
+        )
+        self.assertFalse(any(equipments.mapped("serial_no")))
+        category.write({"sequence_prefix": "BLK", "sequence_number_next": 1})
+        self.assertEqual(
+            equipments.mapped("serial_no"), ["BLK%04d" % i for i in range(1, 6)]
+        )
+        self.assertEqual(category.sequence_id._reserve_next(2), ["BLK0006", "BLK0007"])
+        # Background assignment
+        equipments.write({"serial_no": False})
+        self.assertEqual(equipments[0].serial_no, "BLK0008")
+        category.sequence_id = False
+        equipments.write({"serial_no": False})
+        self.patch(type(category), "_equipment_code_async_threshold", 3)
+        category.write({"sequence_prefix": "ASY"})
+        self.assertTrue(category.equipment_code_pending)
+        self.assertFalse(any(equipments.mapped("serial_no")))
+        self.maintenance_equipment_categ_obj._cron_assign_equipment_code()
+        self.assertFalse(category.equipment_code_pending)
+        self.assertEqual(
+            equipments.mapped("serial_no"), ["ASY%04d" % i for i in range(1, 6)]
+        )
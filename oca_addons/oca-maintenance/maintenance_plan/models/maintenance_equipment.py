@@ -2,9 +2,13 @@
 # Copyright 2019-20 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
 
+import threading
+
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
 
+from .maintenance_plan import REQUEST_CHUNK_SIZE
+
 
 class MaintenanceEquipment(models.Model):
     _inherit = "maintenance.equipment"
@@ -25,6 +29,19 @@ class MaintenanceEquipment(models.Model):
     maintenance_team_required = fields.Boolean(compute="_compute_team_required")
     notes = fields.Text()
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        equipments = super().create(vals_list)
+        self.env["maintenance.plan"]._refresh_equipments_domain_plans(equipments)
+        return equipments
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env["maintenance.plan"]._refresh_equipments_domain_plans(
+            self, fnames=set(vals)
+        )
+        return res
+
     @api.depends("maintenance_plan_ids", "maintenance_plan_ids.active")
     def _compute_maintenance_plan_count(self):
         for equipment in self:
@@ -66,12 +83,20 @@ class MaintenanceEquipment(models.Model):
                     )
                 )
 
-    def _prepare_requests_from_plan(self, maintenance_plan, next_maintenance_date):
+    def _prepare_requests_from_plan(
+        self, maintenance_plan, next_maintenance_date, equipments=None
+    ):
+        """Prepare the request values of ``maintenance_plan`` for a date.
+
+        :param equipments: equipments of a domain based plan, when already
+            computed by the caller
+        """
         if self:
             return self._prepare_request_from_plan(
                 maintenance_plan, next_maintenance_date
             )
-        equipments = maintenance_plan._get_maintenance_equipments()
+        if equipments is None:
+            equipments = maintenance_plan._get_maintenance_equipments()
         return [
             equipment._prepare_request_from_plan(
                 maintenance_plan, next_maintenance_date
@@ -115,85 +140,54 @@ class MaintenanceEquipment(models.Model):
         return data
 
     def _create_new_request(self, mtn_plan):
-        # Compute horizon date adding to today the planning horizon
-        horizon_date = fields.Date.today() + mtn_plan.get_relativedelta(
-            mtn_plan.maintenance_plan_horizon, mtn_plan.planning_step or "year"
-        )
-        # We check maintenance request already created and create until
-        # planning horizon is met
-        start_maintenance_date_plan = mtn_plan.start_maintenance_date
-        furthest_maintenance_request = self.env["maintenance.request"].search(
-            [
-                ("maintenance_plan_id", "=", mtn_plan.id),
-                ("request_date", ">=", start_maintenance_date_plan),
-            ],
-            order="request_date desc",
-            limit=1,
-        )
-        if furthest_maintenance_request:
-            next_maintenance_date = (
-                furthest_maintenance_request.request_date
-                + mtn_plan.get_relativedelta(
-                    mtn_plan.interval, mtn_plan.interval_step or "year"
-                )
-            )
-        else:
-            next_maintenance_date = mtn_plan.next_maintenance_date
-        skip_notify_follower = mtn_plan.skip_notify_follower_on_requests
-        # Skip assigned mail + Activity mail
-        request_model = self.env["maintenance.request"].with_context(
-            mail_activity_quick_update=skip_notify_follower,
-            mail_auto_subscribe_no_notify=skip_notify_follower,
-        )
-        requests = request_model
-        # Create maintenance request until we reach planning horizon
-        while next_maintenance_date <= horizon_date:
-            if next_maintenance_date >= fields.Date.today():
-                vals = self._prepare_requests_from_plan(mtn_plan, next_maintenance_date)
-                requests |= request_model.create(vals)
-            next_maintenance_date = next_maintenance_date + mtn_plan.get_relativedelta(
-                mtn_plan.interval, mtn_plan.interval_step or "year"
-            )
-        return requests
+        return mtn_plan._generate_requests(equipment=self)
 
     @api.model
-    def _cron_generate_requests(self):
+    def _cron_generate_requests(self, chunk_size=REQUEST_CHUNK_SIZE):
         """
         Generates maintenance request on the next_maintenance_date or
         today if none exists
         """
-        for plan in (
+        plans = (
             self.env["maintenance.plan"]
             .sudo()
-            .search([("interval", ">", 0)])
-            .filtered(lambda x: True if not x.equipment_id else x.equipment_id.active)
-        ):
-            equipment = plan.equipment_id
-            equipment._create_new_request(plan)
+            .search(
+                [
+                    ("interval", ">", 0),
+                    "|",
+                    ("equipment_id", "=", False),
+                    ("equipment_id.active", "=", True),
+                ]
+            )
+        )
+        # Catch up changes of the domain based plans' equipments the
+        # index cannot follow (related records, dates...)
+        plans.filtered("generate_with_domain")._refresh_domain_equipments()
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        plans._generate_requests(chunk_size=chunk_size, auto_commit=auto_commit)
 
     @api.depends(
         "maintenance_plan_ids.next_maintenance_date", "maintenance_ids.request_date"
     )
     def _compute_next_maintenance(self):
         """Redefine the function to display next_action_date in kanban view"""
+        unplanned_groups = self.env["maintenance.request"]._read_group(
+            [
+                ("equipment_id", "in", self._origin.ids),
+                ("maintenance_kind_id", "=", None),
+                ("request_date", ">", fields.Date.context_today(self)),
+                ("stage_id.done", "!=", True),
+                ("close_date", "=", False),
+            ],
+            ["equipment_id"],
+            ["request_date:min"],
+        )
+        next_unplanned_dates = {
+            equipment.id: request_date for equipment, request_date in unplanned_groups
+        }
         for equipment in self:
-            next_plan_dates = equipment.maintenance_plan_ids.mapped(
-                "next_maintenance_date"
-            )
-            next_unplanned_dates = (
-                self.env["maintenance.request"]
-                .search(
-                    [
-                        ("equipment_id", "=", equipment.id),
-                        ("maintenance_kind_id", "=", None),
-                        ("request_date", ">", fields.Date.context_today(self)),
-                        ("stage_id.done", "!=", True),
-                        ("close_date", "=", False),
-                    ]
-                )
-                .mapped("request_date")
-            )
-            if len(next_plan_dates + next_unplanned_dates) <= 0:
-                equipment.next_action_date = None
-            else:
-                equipment.next_action_date = min(next_plan_dates + next_unplanned_dates)
+            next_dates = equipment.maintenance_plan_ids.mapped("next_maintenance_date")
+            if next_unplanned_dates.get(equipment._origin.id):
+                next_dates.append(next_unplanned_dates[equipment._origin.id])
+            next_dates = [next_date for next_date in next_dates if next_date]
+            equipment.next_action_date = min(next_dates) if next_dates else None
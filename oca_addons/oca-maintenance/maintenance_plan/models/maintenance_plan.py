@@ -4,9 +4,12 @@
 
 from dateutil.relativedelta import relativedelta
 
-from odoo import _, api, fields, models
+from odoo import Command, _, api, fields, models, tools
 from odoo.exceptions import UserError, ValidationError
-from odoo.tools import safe_eval
+from odoo.tools import safe_eval, split_every
+
+# Number of maintenance requests created (and committed by the cron) at once
+REQUEST_CHUNK_SIZE = 500
 
 
 class MaintenancePlan(models.Model):
@@ -81,27 +84,151 @@ class MaintenancePlan(models.Model):
     )
     generate_with_domain = fields.Boolean()
     generate_domain = fields.Char(string="Apply on")
+    # Materialized equipment -> plans index of the domain based plans,
+    # refreshed when plans or equipments change
+    domain_equipment_ids = fields.Many2many(
+        comodel_name="maintenance.equipment",
+        relation="maintenance_plan_domain_equipment_rel",
+        column1="plan_id",
+        column2="equipment_id",
+        string="Equipments Matching the Domain",
+        readonly=True,
+        copy=False,
+    )
     search_equipment_id = fields.Many2one(
         comodel_name="maintenance.equipment",
         compute="_compute_search_equipment",
         search="_search_search_equipment",
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        plans = super().create(vals_list)
+        domain_plans = plans.filtered("generate_with_domain")
+        if domain_plans:
+            domain_plans._refresh_domain_equipments()
+        return plans
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "generate_with_domain" in vals or "generate_domain" in vals:
+            self._refresh_domain_equipments()
+        return res
+
     @api.model
     def _search_search_equipment(self, operator, value):
         if operator != "=" or (not value and not isinstance(value, models.NewId)):
             raise ValueError(_("Unsupported search operator"))
-        plans = self.search([("generate_with_domain", "=", True)])
-        plan_ids = []
-        equipment = self.env["maintenance.equipment"].browse(value)
-        for plan in plans:
-            if equipment.filtered_domain(
-                safe_eval.safe_eval(
-                    plan.generate_domain or "[]", plan._get_eval_context()
+        return [
+            "|",
+            ("equipment_id", "=", value),
+            ("domain_equipment_ids", "in", [value]),
+        ]
+
+    def _refresh_domain_equipments(self):
+        """Recompute the equipments matching the domain of the plans."""
+        equipment_model = (
+            self.env["maintenance.equipment"].sudo().with_context(active_test=False)
+        )
+        for plan in self.sudo():
+            equipments = equipment_model
+            if plan.generate_with_domain:
+                equipments = equipment_model.search(plan._get_generate_domain())
+            plan.domain_equipment_ids = [Command.set(equipments.ids)]
+
+    @api.model
+    def _get_domain_plans_field_names(self):
+        """Return the equipment fields used by the domains of all the domain
+        based plans, cached on the domains themselves.
+        """
+        self.flush_model(["generate_with_domain", "generate_domain"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT COALESCE(generate_domain, '[]')
+            FROM maintenance_plan
+            WHERE generate_with_domain
+            """
+        )
+        generate_domains = tuple(sorted(row[0] for row in self.env.cr.fetchall()))
+        return self._get_domains_field_names(generate_domains)
+
+    @api.model
+    @tools.ormcache("generate_domains")
+    def _get_domains_field_names(self, generate_domains):
+        return frozenset().union(
+            *(
+                self._get_domain_field_names(
+                    self._parse_generate_domain(generate_domain)
                 )
+                for generate_domain in generate_domains
+            )
+        )
+
+    @api.model
+    def _refresh_equipments_domain_plans(self, equipments, fnames=None):
+        """Update the domain based plans matched by ``equipments``.
+
+        :param fnames: written equipment fields, plans whose domain does not
+            use any of them are left untouched
+        """
+        if fnames is not None and fnames.isdisjoint(
+            self._get_domain_plans_field_names()
+        ):
+            return
+        plans = (
+            self.sudo()
+            .with_context(active_test=False)
+            .search([("generate_with_domain", "=", True)])
+        )
+        equipments = equipments.sudo().with_context(active_test=False)
+        for plan in plans:
+            domain = plan._get_generate_domain()
+            if fnames is not None and not (
+                fnames & self._get_domain_field_names(domain)
             ):
-                plan_ids.append(plan.id)
-        return ["|", ("equipment_id", "=", value), ("id", "in", plan_ids)]
+                continue
+            matching = equipments.filtered_domain(domain)
+            plan.domain_equipment_ids = [
+                Command.link(equipment.id) for equipment in matching
+            ] + [Command.unlink(equipment.id) for equipment in equipments - matching]
+
+    @api.model
+    def _get_domain_field_names(self, domain):
+        """Return the equipment fields a domain depends on."""
+        return {
+            leaf[0].split(".")[0]
+            for leaf in domain
+            if isinstance(leaf, list | tuple) and isinstance(leaf[0], str)
+        } | {"active"}
+
+    def _get_generate_domain(self):
+        self.ensure_one()
+        return self._parse_generate_domain(self.generate_domain or "[]")
+
+    @api.model
+    def _parse_generate_domain(self, generate_domain):
+        """Evaluate a plan domain, reusing the parsed domain when possible.
+
+        Domains using the evaluation context (dates...) depend on when they
+        are evaluated and are not cached.
+        """
+        eval_context = self._get_eval_context()
+        if any(name in generate_domain for name in eval_context):
+            return safe_eval.safe_eval(generate_domain, eval_context)
+        return list(self._parse_static_generate_domain(generate_domain))
+
+    @api.model
+    @tools.ormcache("generate_domain")
+    def _parse_static_generate_domain(self, generate_domain):
+        # keyed by the domain itself: writing another domain on a plan
+        # invalidates its cached value. Leaves and values are turned into
+        # tuples, so that callers cannot alter the cached domain.
+        def freeze(value):
+            if isinstance(value, list | tuple):
+                return tuple(freeze(item) for item in value)
+            return value
+
+        return freeze(safe_eval.safe_eval(generate_domain, self._get_eval_context()))
 
     @api.depends("equipment_id")
     def _compute_search_equipment(self):
@@ -160,42 +287,89 @@ class MaintenancePlan(models.Model):
         "maintenance_ids.close_date",
     )
     def _compute_next_maintenance(self):
-        for plan in self.filtered(lambda x: x.interval > 0):
-            interval_timedelta = plan.get_relativedelta(
-                plan.interval, plan.interval_step
-            )
+        plans = self.filtered(lambda x: x.interval > 0)
+        request_dates = plans._get_request_date_bounds()
+        today = fields.Date.today()
+        for plan in plans:
+            next_todo_date, last_date = request_dates.get(plan._origin.id, (None, None))
+            if next_todo_date:
+                plan.next_maintenance_date = next_todo_date
+            elif last_date:
+                plan.next_maintenance_date = last_date + plan.get_relativedelta(
+                    plan.interval, plan.interval_step
+                )
+            else:
+                plan.next_maintenance_date = plan._get_first_occurrence_from(today)
 
-            next_maintenance_todo = self.env["maintenance.request"].search(
-                [
-                    ("maintenance_plan_id", "=", plan.id),
-                    ("stage_id.done", "!=", True),
-                    ("close_date", "=", False),
-                    ("request_date", ">=", plan.start_maintenance_date),
-                ],
-                order="request_date asc",
-                limit=1,
-            )
+    def _get_request_date_bounds(self):
+        """Return the first open and the last request dates of each plan.
 
-            if next_maintenance_todo:
-                plan.next_maintenance_date = next_maintenance_todo.request_date
-            else:
-                last_maintenance_done = self.env["maintenance.request"].search(
-                    [
-                        ("maintenance_plan_id", "=", plan.id),
-                        ("request_date", ">=", plan.start_maintenance_date),
-                    ],
-                    order="request_date desc",
-                    limit=1,
-                )
-                if last_maintenance_done:
-                    plan.next_maintenance_date = (
-                        last_maintenance_done.request_date + interval_timedelta
-                    )
-                else:
-                    next_date = plan.start_maintenance_date
-                    while next_date < fields.Date.today():
-                        next_date = next_date + interval_timedelta
-                    plan.next_maintenance_date = next_date
+        Both are answered for all the plans with a single grouped query, only
+        requests from the plan start date being taken into account.
+
+        :returns: dict -- {plan id: (next open request date, last request date)}
+            for the plans having requests
+        """
+        plans = self.filtered("start_maintenance_date")
+        if not plans._origin:
+            return {}
+        self.env["maintenance.request"].flush_model(
+            ["maintenance_plan_id", "request_date", "close_date", "stage_id"]
+        )
+        self.env["maintenance.stage"].flush_model(["done"])
+        # start dates are passed along so that pending changes are honored
+        self.env.cr.execute(
+            """
+            SELECT req.maintenance_plan_id,
+                MIN(req.request_date) FILTER (
+                    WHERE stage.done IS NOT TRUE AND req.close_date IS NULL
+                ),
+                MAX(req.request_date)
+            FROM maintenance_request req
+            JOIN unnest(%s::int[], %s::date[]) AS plan(id, start_date)
+                ON plan.id = req.maintenance_plan_id
+            LEFT JOIN maintenance_stage stage ON stage.id = req.stage_id
+            WHERE req.request_date >= plan.start_date
+            GROUP BY req.maintenance_plan_id
+            """,
+            (
+                [plan._origin.id for plan in plans if plan._origin],
+                [plan.start_maintenance_date for plan in plans if plan._origin],
+            ),
+        )
+        return {
+            plan_id: (next_todo_date, last_date)
+            for plan_id, next_todo_date, last_date in self.env.cr.fetchall()
+        }
+
+    def _get_first_occurrence_from(self, limit_date):
+        """Return the first occurrence of the plan on or after ``limit_date``.
+
+        Occurrences are computed arithmetically rather than by stepping from
+        the start date, except for month based steps starting after the 28th
+        whose day of month depends on the months they went through.
+        """
+        self.ensure_one()
+        next_date = self.start_maintenance_date
+        if not next_date or next_date >= limit_date:
+            return next_date
+        if self.interval_step in ("day", "week"):
+            step_days = self.interval * (7 if self.interval_step == "week" else 1)
+            steps = -(-(limit_date - next_date).days // step_days)
+            return next_date + relativedelta(days=steps * step_days)
+        step_months = self.interval * (12 if self.interval_step == "year" else 1)
+        if next_date.day > 28:
+            interval_timedelta = relativedelta(months=step_months)
+            while next_date < limit_date:
+                next_date = next_date + interval_timedelta
+            return next_date
+        months = (limit_date.year - next_date.year) * 12 + (
+            limit_date.month - next_date.month
+        )
+        next_date += relativedelta(months=-(-months // step_months) * step_months)
+        if next_date < limit_date:
+            next_date += relativedelta(months=step_months)
+        return next_date
 
     @api.constrains("company_id", "equipment_id")
     def _check_company_id(self):
@@ -245,16 +419,110 @@ class MaintenancePlan(models.Model):
     def button_manual_request_generation(self):
         """Call the same method that the cron for generating manually the maintenance
         requests."""
+        self._generate_requests()
+
+    def _get_last_request_dates(self):
+        """Return the furthest request date of each plan, in one grouped query.
+
+        Only requests from the plan start date are taken into account: as the
+        maximum of all the requests is either before the start date or the
+        maximum of those after it, one query over all the plans is enough.
+
+        :returns: dict -- {plan id: date}
+        """
+        groups = self.env["maintenance.request"]._read_group(
+            [("maintenance_plan_id", "in", self.ids)],
+            ["maintenance_plan_id"],
+            ["request_date:max"],
+        )
+        return {
+            plan.id: last_date
+            for plan, last_date in groups
+            if last_date
+            and (
+                not plan.start_maintenance_date
+                or last_date >= plan.start_maintenance_date
+            )
+        }
+
+    def _get_request_dates_to_generate(self):
+        """Compute in memory the request dates of each plan up to its horizon.
+
+        :returns: dict -- {plan id: [dates]}
+        """
+        today = fields.Date.today()
+        last_dates = self._get_last_request_dates()
+        res = {}
         for plan in self:
-            equipment = plan.equipment_id
-            equipment._create_new_request(plan)
+            interval = plan.get_relativedelta(
+                plan.interval, plan.interval_step or "year"
+            )
+            horizon_date = today + plan.get_relativedelta(
+                plan.maintenance_plan_horizon, plan.planning_step or "year"
+            )
+            if plan.id in last_dates:
+                next_date = last_dates[plan.id] + interval
+            else:
+                next_date = plan.next_maintenance_date
+            dates = []
+            while next_date and next_date <= horizon_date:
+                if next_date >= today:
+                    dates.append(next_date)
+                next_date = next_date + interval
+            res[plan.id] = dates
+        return res
+
+    def _generate_requests(
+        self, equipment=None, chunk_size=REQUEST_CHUNK_SIZE, auto_commit=False
+    ):
+        """Create the maintenance requests of the plans up to their horizon.
+
+        The values of all the requests are prepared first, then created by
+        chunks of about ``chunk_size``, with a commit after each chunk when
+        ``auto_commit`` is set. A chunk always holds all the requests of a
+        date of a plan, so that a run resuming after the last committed
+        request date of a plan does not miss any of them.
+
+        :param equipment: equipment to generate the requests for instead of
+            the plans' own one
+        :returns: the created maintenance requests
+        """
+        plans = self.filtered(lambda p: p.interval > 0)
+        dates_by_plan = plans._get_request_dates_to_generate()
+        vals_by_skip_notify = {True: [], False: []}
+        for plan in plans.filtered(lambda p: dates_by_plan[p.id]):
+            plan_equipment = plan.equipment_id if equipment is None else equipment
+            equipments = None
+            if not plan_equipment:
+                equipments = plan._get_maintenance_equipments()
+            vals_groups = vals_by_skip_notify[plan.skip_notify_follower_on_requests]
+            for next_date in dates_by_plan[plan.id]:
+                vals = plan_equipment._prepare_requests_from_plan(
+                    plan, next_date, equipments=equipments
+                )
+                vals_groups.append([vals] if isinstance(vals, dict) else vals)
+        requests = self.env["maintenance.request"]
+        for skip_notify, vals_groups in vals_by_skip_notify.items():
+            # Skip assigned mail + Activity mail
+            request_model = requests.with_context(
+                mail_activity_quick_update=skip_notify,
+                mail_auto_subscribe_no_notify=skip_notify,
+                mail_create_nolog=skip_notify,
+            )
+            chunk = []
+            for index, vals_list in enumerate(vals_groups, start=1):
+                chunk.extend(vals_list)
+                if len(chunk) < chunk_size and index < len(vals_groups):
+                    continue
+                for vals_chunk in split_every(chunk_size, chunk, piece_maker=list):
+                    requests |= request_model.create(vals_chunk)
+                chunk = []
+                if auto_commit:
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+        return requests
 
     def _get_maintenance_equipments(self):
         self.ensure_one()
         if self.generate_with_domain and not self.equipment_id:
-            return self.env["maintenance.equipment"].search(
-                safe_eval.safe_eval(
-                    self.generate_domain or "[]", self._get_eval_context()
-                )
-            )
+            return self.env["maintenance.equipment"].search(self._get_generate_domain())
         return [self.equipment_id]
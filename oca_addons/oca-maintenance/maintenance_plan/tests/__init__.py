@@ -1,2 +1,3 @@
 from . import test_maintenance_plan
 from . import test_maintenance_plan_domain
+from . import test_maintenance_plan_benchmark
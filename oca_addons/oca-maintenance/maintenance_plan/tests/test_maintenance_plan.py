@@ -229,3 +229,43 @@ class TestMaintenancePlan(TestMaintenancePlanBase):
         self.assertEqual(len(self.maintenance_plan_1.maintenance_ids), 0)
         self.maintenance_plan_1.button_manual_request_generation()
         self.assertEqual(len(self.maintenance_plan_1.maintenance_ids), 3)
+
+    def test_generate_requests_chunked(self):
+        plans = self.maintenance_plan_1 | self.maintenance_plan_2
+        requests = plans._generate_requests(chunk_size=2)
+        # 3 monthly + 9 weekly requests up to the 2 months horizon
+        self.assertEqual(len(requests), 12)
+        self.assertEqual(
+            plans._get_last_request_dates(),
+            {
+                self.maintenance_plan_1.id: fields.Date.from_string("2023-03-25"),
+                self.maintenance_plan_2.id: fields.Date.from_string("2023-03-22"),
+            },
+        )
+        # Nothing left to generate up to the horizon
+        self.assertFalse(plans._generate_requests(chunk_size=2))
+
+    def test_get_first_occurrence_from(self):
+        plan = self.maintenance_plan_1
+        limit_date = fields.Date.from_string("2025-03-30")
+        for start, interval, step in (
+            ("2023-01-24", 1, "month"),
+            ("2023-01-31", 1, "month"),
+            ("2022-03-30", 5, "month"),
+            ("2020-02-29", 1, "year"),
+            ("2023-01-25", 3, "week"),
+            ("2023-01-25", 10, "day"),
+            ("2026-01-01", 1, "month"),
+        ):
+            plan.write(
+                {
+                    "start_maintenance_date": start,
+                    "interval": interval,
+                    "interval_step": step,
+                }
+            )
+            # Compare to stepping one interval at a time
+            expected = plan.start_maintenance_date
+            while expected < limit_date:
+                expected += plan.get_relativedelta(interval, step)
+            self.assertEqual(plan._get_first_occurrence_from(limit_date), expected)
@@ -0,0 +1,47 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+import logging
+import time
+
+from odoo.tests import tagged
+
+from .common import TestMaintenancePlanBase
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged("-standard", "maintenance_plan_benchmark")
+class TestMaintenancePlanBenchmark(TestMaintenancePlanBase):
+    """Timings on large volumes, run with
+    ``--test-tags maintenance_plan_benchmark``."""
+
+    def test_compute_next_maintenance_50k_plans(self):
+        plans = self.maintenance_plan_obj.create(
+            [
+                {
+                    "start_maintenance_date": "2020-01-%02d" % (1 + i % 28),
+                    "interval": 1 + i % 6,
+                    "interval_step": ("day", "week", "month", "year")[i % 4],
+                }
+                for i in range(50000)
+            ]
+        )
+        self.maintenance_request_obj.create(
+            [
+                {
+                    "name": "Benchmark",
+                    "maintenance_plan_id": plan.id,
+                    "request_date": "2023-06-01",
+                }
+                for plan in plans[:10000]
+            ]
+        )
+        plans.invalidate_recordset(["next_maintenance_date"])
+        start = time.perf_counter()
+        plans._compute_next_maintenance()
+        self.env.flush_all()
+        _logger.info(
+            "next_maintenance_date of %s plans computed in %.2fs",
+            len(plans),
+            time.perf_counter() - start,
+        )
+        self.assertTrue(all(plans.mapped("next_maintenance_date")))
@@ -2,6 +2,7 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
 import json
+from unittest.mock import patch
 
 from odoo.addons.maintenance_plan.tests.common import TestMaintenancePlanBase
 
@@ -36,3 +37,93 @@ class TestMaintenancePlanDomain(TestMaintenancePlanBase):
         self.assertEqual(len(generated_requests), 6)
         self.assertIn(equipment_2, generated_requests.mapped("equipment_id"))
         self.assertIn(self.equipment_1, generated_requests.mapped("equipment_id"))
+
+    def test_generate_requests_domain_commit_whole_dates(self):
+        equipments = self.equipment_1 | self.maintenance_equipment_obj.create(
+            [{"name": "Laptop 2"}, {"name": "Laptop 3"}]
+        )
+        plan = self.maintenance_plan_5
+        plan.write(
+            {
+                "generate_with_domain": True,
+                "generate_domain": json.dumps([("id", "in", equipments.ids)]),
+            }
+        )
+        committed_counts = []
+
+        def commit():
+            committed_counts.append(
+                self.maintenance_request_obj.search_count(
+                    [("maintenance_plan_id", "=", plan.id)]
+                )
+            )
+
+        with patch.object(self.env.cr, "commit", side_effect=commit):
+            requests = plan._generate_requests(chunk_size=2, auto_commit=True)
+        self.assertEqual(len(requests), 9)
+        # Commits never split the requests of a date between equipments
+        self.assertEqual(committed_counts, [3, 6, 9])
+
+    def test_search_equipment_index(self):
+        equipment_2 = self.maintenance_equipment_obj.create({"name": "Laptop 2"})
+        self.maintenance_plan_5.write(
+            {
+                "generate_with_domain": True,
+                "generate_domain": json.dumps([("name", "ilike", "Laptop")]),
+            }
+        )
+        self.assertEqual(
+            self.maintenance_plan_5.domain_equipment_ids,
+            self.equipment_1 | equipment_2,
+        )
+        plans = self.maintenance_plan_obj.search(
+            [("search_equipment_id", "=", equipment_2.id)]
+        )
+        self.assertEqual(plans, self.maintenance_plan_5)
+        # Index follows equipment changes
+        equipment_3 = self.maintenance_equipment_obj.create({"name": "Laptop 3"})
+        self.assertIn(equipment_3, self.maintenance_plan_5.domain_equipment_ids)
+        equipment_2.name = "Desktop 2"
+        self.assertNotIn(equipment_2, self.maintenance_plan_5.domain_equipment_ids)
+        self.assertFalse(
+            self.maintenance_plan_obj.search(
+                [("search_equipment_id", "=", equipment_2.id)]
+            )
+        )
+        # Parsed domains are cached and still honor changes on the plan
+        domain = self.maintenance_plan_5._get_generate_domain()
+        self.assertEqual(domain, [("name", "ilike", "Laptop")])
+        domain.append(("active", "=", True))
+        self.assertEqual(
+            self.maintenance_plan_5._get_generate_domain(),
+            [("name", "ilike", "Laptop")],
+        )
+        self.maintenance_plan_5.generate_with_domain = False
+        self.assertFalse(self.maintenance_plan_5.domain_equipment_ids)
+
+    def test_search_equipment_index_unrelated_write(self):
+        self.maintenance_plan_5.write(
+            {
+                "generate_with_domain": True,
+                "generate_domain": json.dumps([("name", "ilike", "Laptop")]),
+            }
+        )
+        self.assertIn("name", self.maintenance_plan_obj._get_domain_plans_field_names())
+        plan_model = self.env.registry["maintenance.plan"]
+        with patch.object(
+            plan_model, "search", side_effect=plan_model.search, autospec=True
+        ) as search:
+            # Writing fields no plan domain uses does not look for plans
+            self.equipment_1.notes = "Not used by any plan domain"
+            search.assert_not_called()
+            equipment_2 = self.maintenance_equipment_obj.create({"name": "Desktop"})
+            equipment_2.name = "Laptop 2"
+        self.assertIn(equipment_2, self.maintenance_plan_5.domain_equipment_ids)
+        # Changing a domain updates the fields without resetting the caches
+        with patch.object(type(self.env.registry), "clear_cache") as clear_cache:
+            self.maintenance_plan_5.generate_domain = json.dumps(
+                [("model", "=", "Laptop")]
+            )
+            field_names = self.maintenance_plan_obj._get_domain_plans_field_names()
+        clear_cache.assert_not_called()
+        self.assertIn("model", field_names)
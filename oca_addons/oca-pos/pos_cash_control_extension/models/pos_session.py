@@ -14,35 +14,51 @@ class PosSession(models.Model):
         self._post_cash_details_message("Opening", 0.0, notes)
 
     def get_closing_control_data(self):
+        """Compute the expected cash from the cashbox value kept by this
+        module, with the cash payments and moves aggregated by queries. The
+        rest of the data is left to the core and its other extensions."""
         res = super().get_closing_control_data()
-        orders = self._get_closed_orders()
-        cash_payment_method_ids = self.payment_method_ids.filtered(
-            lambda pm: pm.type == "cash"
-        )
-        default_cash_payment_method_id = (
-            cash_payment_method_ids[0] if cash_payment_method_ids else None
-        )
-        payments = orders.payment_ids.filtered(
-            lambda p: p.payment_method_id.type != "pay_later"
-        )
-        total_default_cash_payment_amount = (
-            sum(
-                payments.filtered(
-                    lambda p: p.payment_method_id == default_cash_payment_method_id
-                ).mapped("amount")
-            )
-            if default_cash_payment_method_id
-            else 0
-        )
         if "default_cash_details" in res and res["default_cash_details"]:
+            cash_payment_method_ids = self.payment_method_ids.filtered(
+                lambda pm: pm.type == "cash"
+            )
+            total_default_cash_payment_amount = (
+                self._get_closed_orders_payment_amounts().get(
+                    cash_payment_method_ids[0], 0
+                )
+                if cash_payment_method_ids
+                else 0
+            )
+            [(statement_amount,)] = (
+                self.env["account.bank.statement.line"]
+                .sudo()
+                ._read_group(
+                    [("pos_session_id", "=", self.id)], aggregates=["amount:sum"]
+                )
+            )
             res["default_cash_details"]["opening"] = self.cash_register_balance_start
             res["default_cash_details"]["amount"] = (
                 self.cash_register_balance_start
                 + total_default_cash_payment_amount
-                + sum(self.sudo().statement_line_ids.mapped("amount"))
+                + (statement_amount or 0)
             )
         return res
 
+    def _get_closed_orders_payment_amounts(self):
+        """Total of the payments of the closed orders of the session, per
+        payment method, aggregated in a single query."""
+        self.ensure_one()
+        return dict(
+            self.env["pos.payment"]._read_group(
+                [
+                    ("session_id", "=", self.id),
+                    ("pos_order_id.state", "not in", ["draft", "cancel"]),
+                ],
+                ["payment_method_id"],
+                ["amount:sum"],
+            )
+        )
+
     def _post_statement_difference(self, amount, is_opening):
         pass
 
@@ -35,3 +35,74 @@ class SomethingCase(TransactionCase):
         self.session_id.post_closing_cash_details(170.0)
         self.assertEqual(self.session_id.cash_register_balance_end_real, 150.0)
         self.assertEqual(self.session_id.cash_register_balance_start, 150.0)
+
+    def _get_payment_method(self, payment_method_type):
+        return self.session_id.payment_method_ids.filtered(
+            lambda pm: pm.type == payment_method_type
+        )[:1]
+
+    def _create_order(self, payment_method, amount):
+        return self.env["pos.order"].create(
+            {
+                "session_id": self.session_id.id,
+                "company_id": self.config_id.company_id.id,
+                "amount_tax": 0,
+                "amount_total": amount,
+                "amount_paid": amount,
+                "amount_return": 0,
+                "state": "paid",
+                "payment_ids": [
+                    (0, 0, {"payment_method_id": payment_method.id, "amount": amount})
+                ],
+            }
+        )
+
+    def _get_closing_control_data_query_count(self):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        query_count = self.cr.sql_log_count
+        self.session_id.get_closing_control_data()
+        return self.cr.sql_log_count - query_count
+
+    def test_closed_orders_payment_amounts(self):
+        self.assertEqual(self.session_id._get_closed_orders_payment_amounts(), {})
+        cash_method = self._get_payment_method("cash")
+        order = self._create_order(cash_method, 30)
+        self.assertEqual(
+            self.session_id._get_closed_orders_payment_amounts(), {cash_method: 30}
+        )
+        self.assertEqual(
+            self.session_id.get_closing_control_data()["default_cash_details"][
+                "amount"
+            ],
+            200.0,
+        )
+        order.state = "cancel"
+        self.assertEqual(self.session_id._get_closed_orders_payment_amounts(), {})
+
+    def test_closing_control_data(self):
+        cash_method = self._get_payment_method("cash")
+        bank_method = self._get_payment_method("bank")
+        self._create_order(cash_method, 30)
+        self._create_order(bank_method, 12)
+        self._create_order(bank_method, 8)
+        self._create_order(bank_method, 5).state = "cancel"
+        data = self.session_id.get_closing_control_data()
+        self.assertEqual(data["orders_details"], {"quantity": 3, "amount": 50})
+        self.assertEqual(data["payments_amount"], 50)
+        self.assertEqual(data["default_cash_details"]["payment_amount"], 30)
+        self.assertEqual(data["default_cash_details"]["moves"][0]["amount"], 20.0)
+        [bank_data] = [
+            x for x in data["other_payment_methods"] if x["id"] == bank_method.id
+        ]
+        self.assertEqual(bank_data["amount"], 20)
+        self.assertEqual(bank_data["number"], 2)
+
+    def test_closing_control_data_query_count(self):
+        cash_method = self._get_payment_method("cash")
+        self._create_order(cash_method, 30)
+        query_count = self._get_closing_control_data_query_count()
+        for __ in range(10):
+            self._create_order(cash_method, 30)
+        # The number of queries doesn't depend on the number of orders
+        self.assertEqual(self._get_closing_control_data_query_count(), query_count)
@@ -4,7 +4,7 @@
 
 {
     "name": "POS Lot Selection",
-    "version": "17.0.1.0.1",
+    "version": "17.0.1.1.0",
     "category": "Point of Sale",
     "author": "Tecnativa, Camptocamp, Odoo Community Association (OCA)",
     "website": "https://github.com/OCA/pos",
@@ -12,6 +12,9 @@
     "depends": [
         "point_of_sale",
     ],
+    "data": [
+        "views/res_config_settings_views.xml",
+    ],
     "assets": {
         "point_of_sale._assets_pos": [
             "pos_lot_selection/static/src/js/**/*.js",
@@ -1,4 +1,6 @@
 from . import product_product
 from . import stock_lot
 
+from . import pos_config
 from . import pos_session
+from . import res_config_settings
@@ -0,0 +1,13 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class PosConfig(models.Model):
+    _inherit = "pos.config"
+
+    lazy_load_lots = fields.Boolean(
+        string="Load lots on demand",
+        help="If selected, the available lots of a product are only loaded "
+        "when it is added to an order, instead of when the session opens.",
+    )
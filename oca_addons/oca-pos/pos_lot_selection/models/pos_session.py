@@ -1,18 +1,64 @@
 # Copyright 2024 Dixmit
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import models
+from datetime import timedelta
+
+from odoo import fields, models
 
 
 class PosSession(models.Model):
     _inherit = "pos.session"
 
+    # Quants written by transactions still running when the lots were last
+    # loaded carry an older write_date, so updates are looked up with a margin.
+    _available_lots_update_margin = timedelta(minutes=5)
+
     def _loader_params_product_product(self):
         result = super()._loader_params_product_product()
-        result["search_params"]["fields"].append("available_lot_for_pos_ids")
+        if not self.config_id.lazy_load_lots:
+            result["search_params"]["fields"].append("available_lot_for_pos_ids")
+        return result
+
+    def _pos_data_process(self, loaded_data):
+        result = super()._pos_data_process(loaded_data)
+        loaded_data["available_lots_last_update"] = fields.Datetime.to_string(
+            self.env.cr.now()
+        )
         return result
 
     def get_pos_ui_product_product_by_params(self, custom_search_params):
         return super(
             PosSession, self.with_company(self.company_id.id)
         ).get_pos_ui_product_product_by_params(custom_search_params)
+
+    def get_pos_ui_available_lots_updates(self, last_update):
+        """Return the available lots of the products whose stock changed since
+        ``last_update``, so the POS can refresh them without reloading."""
+        self.ensure_one()
+        now = self.env.cr.now()
+        groups = (
+            self.env["stock.quant"]
+            .sudo()
+            ._read_group(
+                [
+                    (
+                        "write_date",
+                        ">=",
+                        fields.Datetime.to_datetime(last_update)
+                        - self._available_lots_update_margin,
+                    ),
+                    ("lot_id", "!=", False),
+                    ("product_id.available_in_pos", "=", True),
+                ],
+                ["product_id"],
+            )
+        )
+        products = self.env["product.product"].browse(
+            [product.id for (product,) in groups]
+        )
+        return {
+            "lots": products.with_company(self.company_id)._get_available_lots_for_pos(
+                self.company_id.id
+            ),
+            "last_update": fields.Datetime.to_string(now),
+        }
@@ -16,33 +16,49 @@ class ProductProduct(models.Model):
     @api.depends()
     @api.depends_context("company")
     def _compute_available_lot_for_pos(self):
+        lots_by_product = self._get_available_lots_for_pos(self.env.company.id)
         for record in self:
-            record.available_lot_for_pos_ids = record.get_available_lots_for_pos(
-                self.env.company.id
-            )
+            record.available_lot_for_pos_ids = lots_by_product.get(record.id, [])
 
     def get_available_lots_for_pos(self, company_id):
         self.ensure_one()
-        if self.type != "product" or self.tracking == "none":
-            return []
-        lots = (
-            self.env["stock.lot"]
+        return self._get_available_lots_for_pos(company_id).get(self.id, [])
+
+    def _get_available_lots_for_pos(self, company_id):
+        """Return the lots with a positive quantity of the tracked products,
+        indexed by product id, computed with a single query on the quants."""
+        products = self.filtered(
+            lambda product: product.type == "product" and product.tracking != "none"
+        )
+        result = {product.id: [] for product in products}
+        if not products:
+            return result
+        groups = (
+            self.env["stock.quant"]
             .sudo()
-            .search(
+            ._read_group(
                 [
-                    "&",
-                    ["product_id", "=", self.id],
+                    ("product_id", "in", products.ids),
+                    ("lot_id", "!=", False),
+                    "|",
+                    ("lot_id.company_id", "=", company_id),
+                    ("lot_id.company_id", "=", False),
                     "|",
-                    ["company_id", "=", company_id],
-                    ["company_id", "=", False],
-                ]
+                    ("location_id.usage", "=", "internal"),
+                    "&",
+                    ("location_id.usage", "=", "transit"),
+                    ("location_id.company_id", "!=", False),
+                ],
+                ["product_id", "lot_id"],
+                ["quantity:sum"],
             )
         )
-
-        lots = lots.filtered(
-            lambda lot: float_compare(
-                lot.product_qty, 0, precision_digits=lot.product_uom_id.rounding
-            )
+        lot_ids = [
+            lot.id
+            for product, lot, quantity in groups
+            if float_compare(quantity, 0, precision_rounding=product.uom_id.rounding)
             > 0
-        )
-        return [lot._get_pos_info() for lot in lots]
+        ]
+        for lot in self.env["stock.lot"].sudo().browse(lot_ids).sorted():
+            result[lot.product_id.id].append(lot._get_pos_info())
+        return result
@@ -0,0 +1,11 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = "res.config.settings"
+
+    pos_lazy_load_lots = fields.Boolean(
+        related="pos_config_id.lazy_load_lots", readonly=False
+    )
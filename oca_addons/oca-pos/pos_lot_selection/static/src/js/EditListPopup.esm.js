@@ -6,7 +6,6 @@
 */
 
 import {onWillStart, useState} from "@odoo/owl";
-import {ConnectionLostError} from "@web/core/network/rpc_service";
 import {EditListInput} from "@point_of_sale/app/store/select_lot_popup/edit_list_input/edit_list_input";
 import {EditListPopup} from "@point_of_sale/app/store/select_lot_popup/select_lot_popup";
 
@@ -27,26 +26,16 @@ patch(EditListPopup.prototype, {
         onWillStart(this.onWillStart);
     },
     async onWillStart() {
-        if (this.props.title === _t("Lot/Serial Number(s) Required")) {
-            // We keep this in order to ensure that this call is only done
-            // when we add a serial
-            try {
-                const lots = await this.env.services.orm.call(
-                    "product.product",
-                    "get_available_lots_for_pos",
-                    [
-                        [this.env.services.pos.selectedProduct.id],
-                        this.env.services.pos.company.id,
-                    ]
-                );
-                this.data.lots = lots;
-                this.env.services.pos.selectedProduct.available_lot_for_pos_ids = lots;
-            } catch (error) {
-                if (error instanceof ConnectionLostError) {
-                    return;
-                }
-                throw error;
-            }
+        const product = this.env.services.pos.selectedProduct;
+        // We keep this in order to ensure that this call is only done
+        // when we add a serial, or when lots are loaded on demand
+        if (
+            this.props.title === _t("Lot/Serial Number(s) Required") ||
+            product.available_lot_for_pos_ids === undefined
+        ) {
+            await product.loadAvailableLots();
+            // Lots cannot be loaded while offline
+            this.data.lots = product.available_lot_for_pos_ids || [];
         }
     },
 });
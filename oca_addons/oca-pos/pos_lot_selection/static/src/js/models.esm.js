@@ -5,9 +5,24 @@
 */
 
 import {Orderline, Product} from "@point_of_sale/app/store/models";
+import {ConnectionLostError} from "@web/core/network/rpc_service";
 
 import {patch} from "@web/core/utils/patch";
 patch(Product.prototype, {
+    async loadAvailableLots() {
+        try {
+            this.available_lot_for_pos_ids = await this.pos.orm.call(
+                "product.product",
+                "get_available_lots_for_pos",
+                [[this.id], this.pos.company.id]
+            );
+        } catch (error) {
+            if (error instanceof ConnectionLostError) {
+                return;
+            }
+            throw error;
+        }
+    },
     getAddProductOptions() {
         this.pos.selectedProduct = this;
         return super.getAddProductOptions(...arguments);
@@ -0,0 +1,55 @@
+/** @odoo-module */
+/*
+    Copyright 2024 Dixmit
+    License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl)
+*/
+
+import {ConnectionLostError} from "@web/core/network/rpc_service";
+import {PosStore} from "@point_of_sale/app/store/pos_store";
+import {patch} from "@web/core/utils/patch";
+
+// Delay between two refreshes of the available lots, in milliseconds
+const AVAILABLE_LOTS_REFRESH_DELAY = 5 * 60 * 1000;
+
+patch(PosStore.prototype, {
+    async _processData(loadedData) {
+        await super._processData(...arguments);
+        this.availableLotsLastUpdate = loadedData.available_lots_last_update;
+    },
+    async after_load_server_data() {
+        const result = await super.after_load_server_data(...arguments);
+        clearInterval(this.availableLotsRefreshInterval);
+        this.availableLotsRefreshInterval = setInterval(
+            () => this.refreshAvailableLots(),
+            AVAILABLE_LOTS_REFRESH_DELAY
+        );
+        return result;
+    },
+    async closePos() {
+        clearInterval(this.availableLotsRefreshInterval);
+        this.availableLotsRefreshInterval = null;
+        return await super.closePos(...arguments);
+    },
+    async refreshAvailableLots() {
+        let result = null;
+        try {
+            result = await this.orm.call(
+                "pos.session",
+                "get_pos_ui_available_lots_updates",
+                [[this.pos_session.id], this.availableLotsLastUpdate]
+            );
+        } catch (error) {
+            if (error instanceof ConnectionLostError) {
+                return;
+            }
+            throw error;
+        }
+        for (const [productId, lots] of Object.entries(result.lots)) {
+            const product = this.db.get_product_by_id(parseInt(productId, 10));
+            if (product && product.available_lot_for_pos_ids !== undefined) {
+                product.available_lot_for_pos_ids = lots;
+            }
+        }
+        this.availableLotsLastUpdate = result.last_update;
+    },
+});
@@ -1 +1,2 @@
 from . import test_frontend
+from . import test_available_lots
@@ -0,0 +1,55 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo.tests.common import TransactionCase
+
+
+class TestAvailableLots(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.location = cls.env.ref("stock.stock_location_stock")
+        cls.products = cls.env["product.product"].create(
+            [
+                {
+                    "name": "Lot Product %s" % index,
+                    "type": "product",
+                    "tracking": "lot",
+                    "available_in_pos": True,
+                }
+                for index in range(2)
+            ]
+        )
+        cls.untracked_product = cls.env["product.product"].create(
+            {"name": "Untracked Product", "type": "product"}
+        )
+        cls.lots = cls.env["stock.lot"].create(
+            [
+                {
+                    "name": f"LOT-{product.id}-{index}",
+                    "product_id": product.id,
+                    "company_id": cls.env.company.id,
+                }
+                for product in cls.products
+                for index in range(2)
+            ]
+        )
+        for lot in cls.lots[:3]:
+            cls.env["stock.quant"]._update_available_quantity(
+                lot.product_id, cls.location, 10, lot_id=lot
+            )
+
+    def test_available_lots_batch(self):
+        products = self.products | self.untracked_product
+        result = products.mapped("available_lot_for_pos_ids")
+        self.assertEqual(
+            result,
+            [
+                [self.lots[0]._get_pos_info(), self.lots[1]._get_pos_info()],
+                [self.lots[2]._get_pos_info()],
+                [],
+            ],
+        )
+        self.assertEqual(
+            self.products[1].get_available_lots_for_pos(self.env.company.id),
+            [self.lots[2]._get_pos_info()],
+        )
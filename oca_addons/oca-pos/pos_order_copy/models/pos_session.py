@@ -1,7 +1,9 @@
 # Copyright 2024 Dixmit
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import models
+import copy
+
+from odoo import models, tools
 
 
 class PosSession(models.Model):
@@ -9,14 +11,25 @@ class PosSession(models.Model):
 
     def _pos_data_process(self, loaded_data):
         result = super()._pos_data_process(loaded_data)
-        loaded_data["pos_order_copy_fields"] = [
-            field_name
-            for field_name, field in self.env["pos.order"]._fields.items()
-            if field.copy and field.store and not field.automatic and not field.compute
-        ]
-        loaded_data["pos_order_line_copy_fields"] = [
+        loaded_data.update(copy.deepcopy(self._get_pos_static_metadata()))
+        return result
+
+    @tools.ormcache()
+    def _get_pos_static_metadata(self):
+        """Loader data depending only on the installed modules, computed once
+        per registry and shared by all the sessions."""
+        return self._prepare_pos_static_metadata()
+
+    def _prepare_pos_static_metadata(self):
+        """Hook to add loader data which does not depend on the session."""
+        return {
+            "pos_order_copy_fields": self._get_pos_copy_fields("pos.order"),
+            "pos_order_line_copy_fields": self._get_pos_copy_fields("pos.order.line"),
+        }
+
+    def _get_pos_copy_fields(self, model_name):
+        return [
             field_name
-            for field_name, field in self.env["pos.order.line"]._fields.items()
+            for field_name, field in self.env[model_name]._fields.items()
             if field.copy and field.store and not field.automatic and not field.compute
         ]
-        return result
@@ -0,0 +1,45 @@
+# Copyright 2024 Dixmit
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from odoo.addons.point_of_sale.tests.common import TestPoSCommon
+
+
+@tagged("post_install", "-at_install")
+class TestPosSession(TestPoSCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = cls.basic_config
+
+    def setUp(self):
+        super().setUp()
+        self.session = self.open_new_session()
+
+    def test_copy_fields(self):
+        loaded_data = self.session.load_pos_data()
+        self.assertIn("partner_id", loaded_data["pos_order_copy_fields"])
+        self.assertNotIn("date_order", loaded_data["pos_order_copy_fields"])
+        self.assertIn("product_id", loaded_data["pos_order_line_copy_fields"])
+
+    def test_static_metadata_cache(self):
+        PosSession = self.env.registry["pos.session"]
+        prepare = PosSession._prepare_pos_static_metadata
+        self.session.load_pos_data()
+        with patch.object(
+            PosSession,
+            "_prepare_pos_static_metadata",
+            side_effect=prepare,
+            autospec=True,
+        ) as prepare_mock:
+            loaded_data = self.session.load_pos_data()
+        # Computed once per registry, shared by all the sessions
+        prepare_mock.assert_not_called()
+        # Loaded data are copies of the cached ones
+        loaded_data["pos_order_copy_fields"].append("date_order")
+        self.assertNotIn(
+            "date_order", self.session.load_pos_data()["pos_order_copy_fields"]
+        )
@@ -6,7 +6,7 @@
     "summary": """
         Allow to generate a secondary invoice from a point of
         sale order for a second partner""",
-    "version": "17.0.1.0.0",
+    "version": "17.0.1.1.0",
     "license": "AGPL-3",
     "development_status": "Alpha",
     "author": "Dixmit,INVITU,Odoo Community Association (OCA)",
@@ -17,6 +17,7 @@
         "views/pos_order.xml",
         "views/pos_session.xml",
         "views/product_pricelist.xml",
+        "views/res_config_settings.xml",
     ],
     "demo": [],
     "assets": {
@@ -1,5 +1,7 @@
 from . import product_pricelist
+from . import pos_config
 from . import pos_session
 from . import pos_order_line
 from . import pos_order
 from . import account_move
+from . import res_config_settings
@@ -0,0 +1,18 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class PosConfig(models.Model):
+    _inherit = "pos.config"
+
+    split_invoice_at_closing = fields.Boolean(
+        string="Split invoices at closing",
+        help="If selected, the splitting invoices are created all at once when "
+        "the session is closed instead of when each order is validated.",
+    )
+    split_invoice_consolidate = fields.Boolean(
+        string="One split invoice per partner",
+        help="If selected, a single splitting invoice is created per splitting "
+        "partner for the whole session.",
+    )
@@ -1,6 +1,8 @@
 # Copyright 2023 Dixmit
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+from collections import defaultdict
+
 import pytz
 
 from odoo import _, fields, models
@@ -22,6 +24,9 @@ class PosOrder(models.Model):
         if not draft and self.splitting_partner_id and not self.splitting_move_id:
             if not self.partner_id:
                 raise UserError(_("Partner is required when splitting an order"))
+            if self.config_id.split_invoice_at_closing:
+                # Created along with the others when the session is closed
+                return result
             self.splitting_move_id = self.with_company(
                 self.company_id.id
             )._create_splitting_invoice(
@@ -47,7 +52,7 @@ class PosOrder(models.Model):
             new_move.action_post()
         return new_move
 
-    def _prepare_splitting_invoice_vals(self):
+    def _prepare_splitting_invoice_vals(self, cache=None):
         self.ensure_one()
         timezone = pytz.timezone(self._context.get("tz") or self.env.user.tz or "UTC")
         invoice_date = (
@@ -77,7 +82,7 @@ class PosOrder(models.Model):
             "invoice_user_id": self.user_id.id,
             "invoice_date": invoice_date.astimezone(timezone).date(),
             "fiscal_position_id": split_partner.property_account_position_id.id,
-            "invoice_line_ids": self._prepare_splitting_invoice_lines(),
+            "invoice_line_ids": self._prepare_splitting_invoice_lines(cache=cache),
             "invoice_payment_term_id": split_partner.property_payment_term_id.id
             or False,
             "splitting_partner_id": self.partner_id.id,
@@ -100,15 +105,20 @@ class PosOrder(models.Model):
             bank_partner_id = self.company_id.partner_id.bank_ids[0].id
         return bank_partner_id
 
-    def _prepare_splitting_invoice_lines(self):
+    def _prepare_splitting_invoice_lines(self, cache=None):
         """Prepare a list of orm commands containing the dictionaries to fill the
         'invoice_line_ids' field when creating an invoice.
 
+        :param cache: An optional dictionary shared between orders to resolve
+        the accounts and descriptions of each product only once.
+
         :return: A list of Command.create to fill 'invoice_line_ids' when calling
         account.move.create.
         """
         sign = 1 if self.amount_total >= 0 else -1
-        line_values_list = self._prepare_tax_base_splitting_line_values(sign=sign)
+        line_values_list = self._prepare_tax_base_splitting_line_values(
+            sign=sign, cache=cache
+        )
         invoice_lines = []
         for line_values in line_values_list:
             invoice_lines.append(
@@ -128,44 +138,46 @@ class PosOrder(models.Model):
 
         return invoice_lines
 
-    def _prepare_tax_base_splitting_line_values(self, sign=1):
+    def _prepare_tax_base_splitting_line_values(self, sign=1, cache=None):
         """Convert pos order lines into dictionaries that would be used to
         compute taxes later.
 
         :param sign: An optional parameter to force the sign of amounts.
+        :param cache: An optional dictionary shared between orders to resolve
+        the accounts and descriptions of each product only once.
         :return: A list of python dictionaries (see '_convert_to_tax_base_line_dict'
         in account.tax).
         """
         self.ensure_one()
+        if cache is None:
+            cache = {}
         commercial_partner = self.splitting_partner_id.commercial_partner_id
+        fiscal_position = self.splitting_partner_id.property_account_position_id
+        lang = self.splitting_partner_id.lang or self.env.user.lang
 
         base_line_vals_list = []
         for line in self.lines.with_company(self.company_id).filtered(
             lambda r: r.split_invoice_amount
         ):
-            account = line.product_id._get_product_accounts()["income"]
-            if not account:
-                raise UserError(
-                    _(
-                        "Please define income account for this product: "
-                        "'%(name)s' (id:%(id)d).",
-                        name=line.product_id.name,
-                        id=line.product_id.id,
-                    )
-                )
-
-            if self.splitting_partner_id.property_account_position_id:
-                account = (
-                    self.splitting_partner_id.property_account_position_id.map_account(
-                        account
-                    )
+            account_key = (
+                "account",
+                line.product_id,
+                fiscal_position,
+                self.company_id,
+            )
+            if account_key not in cache:
+                cache[account_key] = self._get_splitting_line_account(
+                    line.product_id, fiscal_position
                 )
-
+            account = cache[account_key]
             is_refund = line.qty * line.split_invoice_amount < 0
 
-            product_name = line.product_id.with_context(
-                lang=self.splitting_partner_id.lang or self.env.user.lang
-            ).get_product_multiline_description_sale()
+            name_key = ("name", line.product_id, lang)
+            if name_key not in cache:
+                cache[name_key] = line.product_id.with_context(
+                    lang=lang
+                ).get_product_multiline_description_sale()
+            product_name = cache[name_key]
             base_line_vals_list.append(
                 {
                     **self.env["account.tax"]._convert_to_tax_base_line_dict(
@@ -186,3 +198,111 @@ class PosOrder(models.Model):
                 }
             )
         return base_line_vals_list
+
+    def _get_splitting_line_account(self, product, fiscal_position):
+        account = product._get_product_accounts()["income"]
+        if not account:
+            raise UserError(
+                _(
+                    "Please define income account for this product: "
+                    "'%(name)s' (id:%(id)d).",
+                    name=product.name,
+                    id=product.id,
+                )
+            )
+        if fiscal_position:
+            account = fiscal_position.map_account(account)
+        return account
+
+    def _create_splitting_invoices(self, consolidate=False):
+        """Create the splitting invoices of the orders at once.
+
+        :param consolidate: If set, the orders of a session are invoiced to
+        each splitting partner on a single invoice, except for the refunds of
+        split orders, which keep their own reversal invoice.
+        :return: The created invoices.
+        """
+        orders = self.filtered(
+            lambda order: order.splitting_partner_id
+            and not order.splitting_move_id
+            and order.state not in ("draft", "cancel")
+        )
+        if orders.filtered(lambda order: not order.partner_id):
+            raise UserError(_("Partner is required when splitting an order"))
+        refunds = orders.filtered(lambda order: order.refunded_order_ids & orders)
+        if refunds:
+            # Refunds are linked to the invoices of the orders they refund,
+            # which have to be created first
+            moves = (orders - refunds)._create_splitting_invoices(consolidate)
+            return moves | refunds._create_splitting_invoices(consolidate)
+        groups = defaultdict(lambda: self.browse())
+        for order in orders:
+            if consolidate and not order.refunded_order_ids.splitting_move_id:
+                key = (
+                    order.company_id,
+                    order.session_id,
+                    order.splitting_partner_id,
+                    order.amount_total >= 0,
+                )
+            else:
+                key = (order,)
+            groups[key] |= order
+        cache = {}
+        to_create = defaultdict(list)
+        for group_orders in groups.values():
+            company = group_orders.company_id
+            vals = group_orders.with_company(
+                company
+            )._prepare_grouped_splitting_invoice_vals(cache)
+            to_create[(company, vals["move_type"])].append((group_orders, vals))
+        moves = self.env["account.move"]
+        for (company, move_type), orders_vals in to_create.items():
+            new_moves = (
+                self.env["account.move"]
+                .sudo()
+                .with_company(company)
+                .with_context(default_move_type=move_type)
+                .create([vals for __, vals in orders_vals])
+            )
+            for (group_orders, __), move in zip(orders_vals, new_moves, strict=True):
+                group_orders.splitting_move_id = move
+                origin = (
+                    group_orders if len(group_orders) == 1 else group_orders.session_id
+                )
+                move.message_post(
+                    body=_(
+                        "This invoice has been created from the point of sale "
+                        "session: %s",
+                        origin._get_html_link(),
+                    )
+                )
+            new_moves.filtered(lambda move: move.auto_post == "no").action_post()
+            moves |= new_moves
+        return moves
+
+    def _prepare_grouped_splitting_invoice_vals(self, cache):
+        """Values of a single splitting invoice for all the orders of self,
+        which share the same company, splitting partner and sign."""
+        vals = self[0]._prepare_splitting_invoice_vals(cache=cache)
+        if len(self) == 1:
+            return vals
+        for order in self[1:]:
+            order_vals = order._prepare_splitting_invoice_vals(cache=cache)
+            vals["invoice_line_ids"] += order_vals["invoice_line_ids"]
+            vals["pos_refunded_invoice_ids"] += order_vals["pos_refunded_invoice_ids"]
+            vals["invoice_date"] = max(vals["invoice_date"], order_vals["invoice_date"])
+        session = self.session_id
+        vals.update(
+            {
+                "invoice_origin": ", ".join(self.mapped("name")),
+                "ref": session.name,
+                "invoice_user_id": session.user_id.id,
+                "splitting_partner_id": len(self.partner_id) == 1
+                and self.partner_id.id,
+                "splitting_order_id": False,
+            }
+        )
+        notes = [note for note in self.mapped("note") if note]
+        if notes:
+            vals["narration"] = "\n".join(notes)
+        return vals
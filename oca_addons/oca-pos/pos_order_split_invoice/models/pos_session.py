@@ -14,3 +14,10 @@ class PosSession(models.Model):
         result.append("split_percentage")
         result.append("split_base")
         return result
+
+    def _validate_session(self, *args, **kwargs):
+        for session in self.filtered("config_id.split_invoice_at_closing"):
+            session.order_ids._create_splitting_invoices(
+                consolidate=session.config_id.split_invoice_consolidate
+            )
+        return super()._validate_session(*args, **kwargs)
@@ -0,0 +1,14 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo import fields, models
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = "res.config.settings"
+
+    pos_split_invoice_at_closing = fields.Boolean(
+        related="pos_config_id.split_invoice_at_closing", readonly=False
+    )
+    pos_split_invoice_consolidate = fields.Boolean(
+        related="pos_config_id.split_invoice_consolidate", readonly=False
+    )
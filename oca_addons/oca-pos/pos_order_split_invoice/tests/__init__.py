@@ -1 +1,2 @@
 from . import test_frontend
+from . import test_split_invoice_at_closing
@@ -0,0 +1,126 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from odoo.tests import tagged
+
+from odoo.addons.point_of_sale.tests.common import TestPoSCommon
+
+
+@tagged("post_install", "-at_install")
+class TestSplitInvoiceAtClosing(TestPoSCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.config = cls.basic_config
+        cls.config.split_invoice_at_closing = True
+        cls.product = cls.env["product.product"].create(
+            {
+                "name": "Split Product",
+                "type": "consu",
+                "available_in_pos": True,
+                "list_price": 100,
+                "taxes_id": [(5, 0, 0)],
+            }
+        )
+        cls.splitting_partner = cls.env["res.partner"].create(
+            {"name": "Splitting Partner"}
+        )
+        cls.customer_1 = cls.env["res.partner"].create({"name": "Customer 1"})
+        cls.customer_2 = cls.env["res.partner"].create({"name": "Customer 2"})
+
+    def _create_paid_order(self, session, customer, qty=1):
+        order = self.env["pos.order"].create(
+            {
+                "company_id": self.env.company.id,
+                "session_id": session.id,
+                "partner_id": customer.id,
+                "splitting_partner_id": self.splitting_partner.id,
+                "lines": [
+                    (
+                        0,
+                        0,
+                        {
+                            "name": "Split/0001",
+                            "product_id": self.product.id,
+                            "price_unit": 10,
+                            "split_invoice_amount": 90,
+                            "qty": qty,
+                            "price_subtotal": 10 * qty,
+                            "price_subtotal_incl": 10 * qty,
+                        },
+                    )
+                ],
+                "amount_tax": 0.0,
+                "amount_total": 10 * qty,
+                "amount_paid": 0.0,
+                "amount_return": 0.0,
+                "last_order_preparation_change": "{}",
+            }
+        )
+        self._pay_order(order)
+        return order
+
+    def _pay_order(self, order):
+        payment = (
+            self.env["pos.make.payment"]
+            .with_context(active_ids=order.ids, active_id=order.id)
+            .create({"amount": order.amount_total})
+        )
+        payment.with_context(active_id=order.id).check()
+
+    def _refund_order(self, order):
+        refund = self.env["pos.order"].browse(order.refund()["res_id"])
+        self._pay_order(refund)
+        return refund
+
+    def test_split_invoices_at_closing(self):
+        session = self.open_new_session()
+        order_1 = self._create_paid_order(session, self.customer_1)
+        order_2 = self._create_paid_order(session, self.customer_2, qty=2)
+        self.assertFalse((order_1 | order_2).splitting_move_id)
+        session.action_pos_session_closing_control()
+        for order, customer, amount in (
+            (order_1, self.customer_1, 90),
+            (order_2, self.customer_2, 180),
+        ):
+            move = order.splitting_move_id
+            self.assertEqual(move.state, "posted")
+            self.assertEqual(move.move_type, "out_invoice")
+            self.assertEqual(move.partner_id, self.splitting_partner)
+            self.assertEqual(move.splitting_partner_id, customer)
+            self.assertEqual(move.splitting_order_id, order)
+            self.assertAlmostEqual(move.amount_untaxed, amount)
+        self.assertNotEqual(order_1.splitting_move_id, order_2.splitting_move_id)
+
+    def test_split_invoices_at_closing_consolidated(self):
+        self.config.split_invoice_consolidate = True
+        session = self.open_new_session()
+        order_1 = self._create_paid_order(session, self.customer_1)
+        order_2 = self._create_paid_order(session, self.customer_2, qty=2)
+        session.action_pos_session_closing_control()
+        move = order_1.splitting_move_id
+        self.assertEqual(order_2.splitting_move_id, move)
+        self.assertEqual(move.state, "posted")
+        self.assertEqual(move.partner_id, self.splitting_partner)
+        self.assertFalse(move.splitting_partner_id)
+        self.assertFalse(move.splitting_order_id)
+        self.assertEqual(move.ref, session.name)
+        self.assertIn(order_1.name, move.invoice_origin)
+        self.assertIn(order_2.name, move.invoice_origin)
+        self.assertAlmostEqual(move.amount_untaxed, 270)
+
+    def test_split_invoices_at_closing_refund(self):
+        for consolidate in (False, True):
+            self.config.split_invoice_consolidate = consolidate
+            session = self.open_new_session()
+            order = self._create_paid_order(session, self.customer_1)
+            refund = self._refund_order(order)
+            session.action_pos_session_closing_control()
+            move = order.splitting_move_id
+            refund_move = refund.splitting_move_id
+            self.assertTrue(move)
+            self.assertNotEqual(refund_move, move)
+            self.assertEqual(refund_move.move_type, "out_refund")
+            self.assertEqual(refund_move.reversed_entry_id, move)
+            self.assertEqual(refund_move.pos_refunded_invoice_ids, move)
+            self.assertAlmostEqual(refund_move.amount_untaxed, 90)
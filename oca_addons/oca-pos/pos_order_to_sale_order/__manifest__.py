@@ -4,7 +4,7 @@
 
 {
     "name": "PoS Order To Sale Order",
-    "version": "17.0.1.0.1",
+    "version": "17.0.1.1.0",
     "author": "GRAP,Odoo Community Association (OCA)",
     "category": "Point Of Sale",
     "license": "AGPL-3",
@@ -12,12 +12,17 @@
     "maintainers": ["legalsylvain"],
     "development_status": "Production/Stable",
     "website": "https://github.com/OCA/pos",
-    "data": ["views/view_res_config_settings.xml"],
+    "data": [
+        "data/ir_cron.xml",
+        "views/view_res_config_settings.xml",
+        "views/view_sale_order.xml",
+    ],
     "assets": {
         "point_of_sale._assets_pos": [
             "pos_order_to_sale_order/static/src/css/pos.scss",
             "pos_order_to_sale_order/static/src/js/CreateOrderButton.esm.js",
             "pos_order_to_sale_order/static/src/js/CreateOrderPopup.esm.js",
+            "pos_order_to_sale_order/static/src/js/pos_store.esm.js",
             "pos_order_to_sale_order/static/src/xml/CreateOrderButton.xml",
             "pos_order_to_sale_order/static/src/xml/CreateOrderPopup.xml",
         ],
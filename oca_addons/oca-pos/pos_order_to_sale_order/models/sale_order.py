@@ -2,12 +2,51 @@
 # @author: Sylvain LE GAL (https://twitter.com/legalsylvain)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import Command, _, api, models
+import logging
+import threading
+
+from odoo import Command, _, api, fields, models
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
 
 
 class SaleOrder(models.Model):
     _inherit = "sale.order"
 
+    _pos_pending_action_chunk_size = 100
+
+    pos_order_uid = fields.Char(
+        string="PoS Order Reference",
+        copy=False,
+        readonly=True,
+        index="btree_not_null",
+        help="Unique reference of the PoS order this sale order was created "
+        "from, used to ignore orders sent twice.",
+    )
+    pos_pending_action = fields.Selection(
+        selection=[("delivered", "Deliver"), ("invoiced", "Deliver and Invoice")],
+        copy=False,
+        readonly=True,
+        help="Remaining processing of an order created from the PoS, done "
+        "asynchronously.",
+    )
+    pos_pending_action_error = fields.Text(
+        copy=False,
+        readonly=True,
+        help="Error raised while doing the remaining processing of an order "
+        "created from the PoS. The order is not processed again until it is "
+        "retried.",
+    )
+
+    _sql_constraints = [
+        (
+            "pos_order_uid_uniq",
+            "unique(pos_order_uid)",
+            "A sale order has already been created from this PoS order.",
+        )
+    ]
+
     @api.model
     def _prepare_from_pos(self, order_data):
         PosSession = self.env["pos.session"]
@@ -25,10 +64,19 @@ class SaleOrder(models.Model):
             "pricelist_id": order_data["pricelist_id"],
             "fiscal_position_id": order_data["fiscal_position_id"],
             "order_line": order_lines,
+            "pos_order_uid": order_data.get("uid"),
         }
 
     @api.model
     def create_order_from_pos(self, order_data, action):
+        if order_data.get("uid"):
+            sale_order = self.search(
+                [("pos_order_uid", "=", order_data["uid"])], limit=1
+            )
+            if sale_order:
+                return {
+                    "sale_order_id": sale_order.id,
+                }
         # Create Draft Sale order
         order_vals = self._prepare_from_pos(order_data)
         sale_order = self.with_context(
@@ -42,10 +90,7 @@ class SaleOrder(models.Model):
 
         # mark picking as delivered
         if action in ["delivered", "invoiced"]:
-            # Mark all moves are delivered
-            for move in sale_order.mapped("picking_ids.move_ids_without_package"):
-                move.quantity = move.product_uom_qty
-            sale_order.mapped("picking_ids").button_validate()
+            sale_order._deliver_from_pos()
 
         if action in ["invoiced"]:
             # Create and confirm invoices
@@ -55,3 +100,129 @@ class SaleOrder(models.Model):
         return {
             "sale_order_id": sale_order.id,
         }
+
+    @api.model
+    def create_orders_from_pos(self, orders_data, action):
+        """Create the sale orders of several PoS orders at once, e.g. when a
+        till replays its orders after being offline.
+
+        PoS orders already sent, identified by their ``uid``, are not created
+        again. Delivery and invoicing are done asynchronously.
+
+        :return: A list with, for each PoS order, its ``uid``, the id of the
+            sale order and whether it had already been created.
+        """
+        uids = [order_data.get("uid") for order_data in orders_data]
+        existing = {
+            order.pos_order_uid: order
+            for order in self.search([("pos_order_uid", "in", [x for x in uids if x])])
+        }
+        to_create = []
+        for index, (uid, order_data) in enumerate(zip(uids, orders_data, strict=True)):
+            if uid and uid in existing:
+                continue
+            if uid:
+                existing[uid] = None
+            to_create.append((index, order_data))
+        sale_orders = self.create(
+            [self._prepare_from_pos(order_data) for __, order_data in to_create]
+        )
+        sale_orders._add_pos_customer_notes(
+            [order_data for __, order_data in to_create]
+        )
+        sale_orders._recompute_taxes()
+        if action in ["confirmed", "delivered", "invoiced"]:
+            sale_orders.action_confirm()
+        if action in ["delivered", "invoiced"]:
+            sale_orders.write({"pos_pending_action": action})
+            self.env.ref(
+                "pos_order_to_sale_order.ir_cron_process_pos_sale_orders"
+            )._trigger()
+        created = {
+            index: sale_order
+            for (index, __), sale_order in zip(to_create, sale_orders, strict=True)
+        }
+        existing.update(
+            {order.pos_order_uid: order for order in sale_orders if order.pos_order_uid}
+        )
+        result = []
+        for index, uid in enumerate(uids):
+            sale_order = created.get(index)
+            result.append(
+                {
+                    "uid": uid,
+                    "sale_order_id": (sale_order or existing[uid]).id,
+                    "duplicate": not sale_order,
+                }
+            )
+        return result
+
+    def _add_pos_customer_notes(self, orders_data):
+        """Add the customer notes of the PoS order lines to the description
+        of the sale order lines, through the ``pos_order_lines_data`` context
+        key used when a single order is created."""
+        for order, order_data in zip(self, orders_data, strict=True):
+            lines_data = [x[2] for x in order_data.get("lines", [])]
+            if any(line_data.get("customer_note") for line_data in lines_data):
+                order.order_line.filtered("pos_line_ref").with_context(
+                    pos_order_lines_data=lines_data
+                )._compute_name()
+
+    def _deliver_from_pos(self):
+        # Mark all moves are delivered
+        for move in self.mapped("picking_ids.move_ids_without_package"):
+            move.quantity = move.product_uom_qty
+        # Validate without the backorder and SMS wizards, that can't be
+        # answered from the PoS nor from a cron
+        self.mapped("picking_ids").filtered(
+            lambda picking: picking.state not in ("done", "cancel")
+        ).with_context(skip_backorder=True, skip_sms=True).button_validate()
+
+    def _process_pos_pending_action(self):
+        self._deliver_from_pos()
+        to_invoice = self.filtered(lambda order: order.pos_pending_action == "invoiced")
+        if to_invoice:
+            to_invoice._create_invoices(grouped=True).action_post()
+        self.pos_pending_action = False
+
+    @api.model
+    def _cron_process_pos_pending_actions(self):
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        orders = self.search(
+            [
+                ("pos_pending_action", "!=", False),
+                ("pos_pending_action_error", "=", False),
+            ],
+            order="id",
+        )
+        for order_ids in split_every(self._pos_pending_action_chunk_size, orders.ids):
+            chunk = self.browse(order_ids)
+            try:
+                with self.env.cr.savepoint():
+                    chunk._process_pos_pending_action()
+            except Exception:
+                self.env.invalidate_all()
+                # Process the orders of the chunk one by one, flagging the
+                # failing ones so that they don't block the next runs
+                for order in chunk:
+                    order._try_process_pos_pending_action()
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+
+    def action_retry_pos_pending_action(self):
+        self.pos_pending_action_error = False
+        self.env.ref(
+            "pos_order_to_sale_order.ir_cron_process_pos_sale_orders"
+        )._trigger()
+
+    def _try_process_pos_pending_action(self):
+        self.ensure_one()
+        try:
+            with self.env.cr.savepoint():
+                self._process_pos_pending_action()
+        except Exception as e:
+            self.env.invalidate_all()
+            _logger.exception(
+                "Unable to process the pending PoS action of %s", self.name
+            )
+            self.pos_pending_action_error = str(e)
@@ -2,16 +2,24 @@
 # @author: Sylvain LE GAL (https://twitter.com/legalsylvain)
 # License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl.html).
 
-from odoo import api, models
+from odoo import api, fields, models
 
 
 class SaleOrderLine(models.Model):
     _inherit = "sale.order.line"
 
+    pos_line_ref = fields.Integer(
+        string="PoS Order Line Reference",
+        copy=False,
+        readonly=True,
+        help="Position of the PoS order line this line was created from.",
+    )
+
     @api.model
     def _prepare_from_pos(self, sequence, order_line_data):
         return {
             "sequence": sequence,
+            "pos_line_ref": sequence,
             "product_id": order_line_data["product_id"],
             "product_uom_qty": order_line_data["qty"],
             "discount": order_line_data["discount"],
@@ -25,7 +33,7 @@ class SaleOrderLine(models.Model):
         for sequence, line_data in enumerate(
             self.env.context.get("pos_order_lines_data", []), start=1
         ):
-            if line_data.get("customer_note", False) and self.sequence == sequence:
+            if line_data.get("customer_note", False) and self.pos_line_ref == sequence:
                 res += f"\n{line_data.get('customer_note')}"
 
         return res
@@ -1,6 +1,8 @@
 /** @odoo-module */
 
 import {AbstractAwaitablePopup} from "@point_of_sale/app/popup/abstract_awaitable_popup";
+import {ConnectionLostError} from "@web/core/network/rpc_service";
+import {_t} from "@web/core/l10n/translation";
 import {usePos} from "@point_of_sale/app/store/pos_hook";
 import {useService} from "@web/core/utils/hooks";
 
@@ -10,6 +12,7 @@ export class CreateOrderPopup extends AbstractAwaitablePopup {
         this.pos = usePos();
         this.ui = useService("ui");
         this.orm = useService("orm");
+        this.notification = useService("pos_notification");
         this.createOrderClicked = false;
     }
 
@@ -44,19 +47,29 @@ export class CreateOrderPopup extends AbstractAwaitablePopup {
 
     async _createSaleOrder(order_state) {
         const current_order = this.pos.get_order();
+        const order_data = current_order.export_as_JSON();
         this.ui.block();
 
-        return await this.orm
-            .call("sale.order", "create_order_from_pos", [
-                current_order.export_as_JSON(),
+        try {
+            const result = await this.orm.call("sale.order", "create_order_from_pos", [
+                order_data,
                 order_state,
-            ])
-            .catch((error) => {
-                throw error;
-            })
-            .finally(() => {
-                this.ui.unblock();
-            });
+            ]);
+            this.pos.syncPendingSaleOrders();
+            return result;
+        } catch (error) {
+            if (error instanceof ConnectionLostError) {
+                // Created through the batch RPC once back online
+                this.pos.addPendingSaleOrder(order_data, order_state);
+                this.notification.add(
+                    _t("The sale order will be created once back online.")
+                );
+                return false;
+            }
+            throw error;
+        } finally {
+            this.ui.unblock();
+        }
     }
 }
 
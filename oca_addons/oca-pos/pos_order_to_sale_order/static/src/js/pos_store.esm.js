@@ -0,0 +1,60 @@
+/** @odoo-module */
+
+import {ConnectionLostError} from "@web/core/network/rpc_service";
+import {PosStore} from "@point_of_sale/app/store/pos_store";
+import {patch} from "@web/core/utils/patch";
+
+// Sale orders that could not be created while offline, kept in the local
+// storage and sent again through the batch RPC once back online
+const PENDING_SALE_ORDERS_STORE = "pos_order_to_sale_order_pending";
+
+patch(PosStore.prototype, {
+    async after_load_server_data() {
+        const result = await super.after_load_server_data(...arguments);
+        this.syncPendingSaleOrders();
+        return result;
+    },
+    getPendingSaleOrders() {
+        return this.db.load(PENDING_SALE_ORDERS_STORE, []);
+    },
+    addPendingSaleOrder(orderData, orderState) {
+        this.db.save(PENDING_SALE_ORDERS_STORE, [
+            ...this.getPendingSaleOrders(),
+            {order_data: orderData, order_state: orderState},
+        ]);
+    },
+    async syncPendingSaleOrders() {
+        const pendingSaleOrders = this.getPendingSaleOrders();
+        if (!pendingSaleOrders.length || this.syncingPendingSaleOrders) {
+            return;
+        }
+        this.syncingPendingSaleOrders = true;
+        try {
+            const orderStates = new Set(pendingSaleOrders.map((x) => x.order_state));
+            for (const orderState of orderStates) {
+                const ordersData = pendingSaleOrders
+                    .filter((x) => x.order_state === orderState)
+                    .map((x) => x.order_data);
+                // Orders already created are identified by their uid and
+                // are not duplicated
+                await this.orm.call("sale.order", "create_orders_from_pos", [
+                    ordersData,
+                    orderState,
+                ]);
+                const sentUids = new Set(ordersData.map((x) => x.uid));
+                this.db.save(
+                    PENDING_SALE_ORDERS_STORE,
+                    this.getPendingSaleOrders().filter(
+                        (x) => !sentUids.has(x.order_data.uid)
+                    )
+                );
+            }
+        } catch (error) {
+            if (!(error instanceof ConnectionLostError)) {
+                throw error;
+            }
+        } finally {
+            this.syncingPendingSaleOrders = false;
+        }
+    },
+});
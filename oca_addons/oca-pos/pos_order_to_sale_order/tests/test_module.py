@@ -2,7 +2,10 @@
 # @author Sylvain LE GAL (https://twitter.com/legalsylvain)
 # License AGPL-3 - See http://www.gnu.org/licenses/agpl-3.0.html
 
+from unittest.mock import patch
 
+from odoo import Command
+from odoo.exceptions import UserError
 from odoo.tests import tagged
 
 from odoo.addons.point_of_sale.tests.test_frontend import TestPointOfSaleHttpCommon
@@ -62,3 +65,130 @@ class TestUi(TestPointOfSaleHttpCommon):
             order.order_line[1].name,
             "'Product Note' must not contains in sale order line description",
         )
+
+    def _prepare_pos_orders_data(self, count):
+        self.main_pos_config.open_ui()
+        session = self.main_pos_config.current_session_id
+        partner = self.env.ref("base.res_partner_address_31")
+        product = self.env["product.product"].create(
+            {"name": "Batch Product", "type": "product", "list_price": 10}
+        )
+        return [
+            {
+                "uid": "00001-001-%04d" % index,
+                "name": "Order 00001-001-%04d" % index,
+                "pos_session_id": session.id,
+                "partner_id": partner.id,
+                "user_id": self.env.user.id,
+                "pricelist_id": self.main_pos_config.pricelist_id.id,
+                "fiscal_position_id": False,
+                "lines": [
+                    [
+                        0,
+                        0,
+                        {
+                            "product_id": product.id,
+                            "qty": 1,
+                            "discount": 0,
+                            "price_unit": 10,
+                            "tax_ids": [[6, False, []]],
+                            "customer_note": "Note %s" % index,
+                        },
+                    ]
+                ],
+            }
+            for index in range(count)
+        ]
+
+    def test_create_orders_from_pos_batch(self):
+        orders_data = self._prepare_pos_orders_data(3)
+        SaleOrder = self.env["sale.order"]
+        result = SaleOrder.create_orders_from_pos(orders_data, "invoiced")
+        self.assertEqual([x["duplicate"] for x in result], [False] * 3)
+        orders = SaleOrder.browse([x["sale_order_id"] for x in result])
+        self.assertEqual(set(orders.mapped("state")), {"sale"})
+        self.assertEqual(set(orders.mapped("pos_pending_action")), {"invoiced"})
+        self.assertIn("Note 1", orders[1].order_line.name)
+
+        # Orders sent again are not duplicated
+        result = SaleOrder.create_orders_from_pos(orders_data[1:], "invoiced")
+        self.assertEqual([x["duplicate"] for x in result], [True] * 2)
+        self.assertEqual([x["sale_order_id"] for x in result], orders[1:].ids)
+
+        SaleOrder._cron_process_pos_pending_actions()
+        self.assertFalse(any(orders.mapped("pos_pending_action")))
+        self.assertEqual(set(orders.mapped("delivery_status")), {"full"})
+        self.assertEqual(set(orders.mapped("invoice_status")), {"invoiced"})
+        self.assertEqual(len(orders.invoice_ids), 3)
+
+    def test_create_orders_from_pos_batch_notes(self):
+        orders_data = self._prepare_pos_orders_data(1)
+        line_data = orders_data[0]["lines"][0][2]
+        orders_data[0]["lines"].insert(0, [0, 0, dict(line_data, customer_note=False)])
+        SaleOrder = self.env["sale.order"]
+        prepare = self.env.registry["sale.order"]._prepare_from_pos
+
+        def _prepare_from_pos(records, order_data):
+            # Simulate a module adding a section before the PoS lines
+            vals = prepare(records, order_data)
+            vals["order_line"].insert(
+                0, Command.create({"display_type": "line_section", "name": "S"})
+            )
+            return vals
+
+        with patch.object(
+            self.env.registry["sale.order"],
+            "_prepare_from_pos",
+            side_effect=_prepare_from_pos,
+            autospec=True,
+        ):
+            result = SaleOrder.create_orders_from_pos(orders_data, "draft")
+        order = SaleOrder.browse(result[0]["sale_order_id"])
+        pos_lines = order.order_line.filtered("pos_line_ref").sorted("pos_line_ref")
+        self.assertEqual(len(pos_lines), 2)
+        self.assertNotIn("Note 0", pos_lines[0].name)
+        self.assertIn("Note 0", pos_lines[1].name)
+        self.assertNotIn("Note 0", (order.order_line - pos_lines).name or "")
+
+    def test_cron_process_pos_pending_actions_failure(self):
+        orders_data = self._prepare_pos_orders_data(3)
+        SaleOrder = self.env["sale.order"]
+        result = SaleOrder.create_orders_from_pos(orders_data, "delivered")
+        orders = SaleOrder.browse([x["sale_order_id"] for x in result])
+        failing_order = orders[1]
+        process = self.env.registry["sale.order"]._process_pos_pending_action
+
+        def _process_pos_pending_action(records):
+            if failing_order in records:
+                raise UserError("Failure")
+            return process(records)
+
+        with patch.object(
+            self.env.registry["sale.order"],
+            "_process_pos_pending_action",
+            side_effect=_process_pos_pending_action,
+            autospec=True,
+        ):
+            SaleOrder._cron_process_pos_pending_actions()
+        self.assertEqual(failing_order.pos_pending_action, "delivered")
+        self.assertEqual(failing_order.pos_pending_action_error, "Failure")
+        self.assertEqual(
+            set((orders - failing_order).mapped("delivery_status")), {"full"}
+        )
+        self.assertFalse(any((orders - failing_order).mapped("pos_pending_action")))
+
+        # Flagged orders are not processed again
+        with patch.object(
+            self.env.registry["sale.order"],
+            "_process_pos_pending_action",
+            autospec=True,
+        ) as process_mock:
+            SaleOrder._cron_process_pos_pending_actions()
+        process_mock.assert_not_called()
+
+        # Retried orders are processed again
+        failing_order.action_retry_pos_pending_action()
+        self.assertFalse(failing_order.pos_pending_action_error)
+        SaleOrder._cron_process_pos_pending_actions()
+        self.assertFalse(failing_order.pos_pending_action)
+        self.assertEqual(failing_order.delivery_status, "full")
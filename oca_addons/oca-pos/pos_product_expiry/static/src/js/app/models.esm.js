@@ -11,6 +11,13 @@ import {patch} from "@web/core/utils/patch";
 
 patch(Product.prototype, {
     async checkProductLotExpiration(lot) {
+        if (this.available_lot_for_pos_ids === undefined) {
+            await this.loadAvailableLots();
+            if (this.available_lot_for_pos_ids === undefined) {
+                // Lots cannot be loaded while offline: skip the check
+                return false;
+            }
+        }
         const lotData = this.available_lot_for_pos_ids.filter((availableLot) => {
             return lot === availableLot.name;
         });
@@ -1,9 +1,11 @@
 # Copyright 2024 Dixmit (https://www.dixmit.com).
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
+import copy
 from itertools import groupby
 
-from odoo import models
+from odoo import models, tools
+from odoo.tools import SQL
 
 
 class PosSession(models.Model):
@@ -22,12 +24,45 @@ class PosSession(models.Model):
         return res
 
     def _load_product_template_values(self):
+        return copy.deepcopy(
+            self._get_product_template_values(
+                self.env.lang,
+                tuple(self.env.companies.ids),
+                self._get_product_template_values_version(),
+            )
+        )
+
+    def _get_product_template_values_version(self):
+        """Changes whenever an attribute, attribute value or template attribute
+        value is created, written or deleted, in a single query."""
+        models_to_check = [
+            self.env["product.attribute"],
+            self.env["product.attribute.value"],
+            self.env["product.template.attribute.value"],
+        ]
+        queries = []
+        for model in models_to_check:
+            model.flush_model()
+            queries.append(
+                SQL(
+                    "(SELECT COUNT(*), MAX(id), MAX(write_date) FROM %s)",
+                    SQL.identifier(model._table),
+                )
+            )
+        self.env.cr.execute(SQL(" UNION ALL ").join(queries))
+        return tuple(self.env.cr.fetchall())
+
+    @tools.ormcache("lang", "company_ids", "version")
+    def _get_product_template_values(self, lang, company_ids, version):
+        """Attribute values loaded by the POS, cached until the ``version``
+        of the attributes changes."""
+        env = self.with_context(lang=lang, allowed_company_ids=list(company_ids)).env
         # performance trick: prefetch fields with search_fetch() and fetch()
-        product_attributes = self.env["product.attribute"].search_fetch(
+        product_attributes = env["product.attribute"].search_fetch(
             [],
             ["name", "display_type", "sequence"],
         )
-        product_template_attribute_values = self.env[
+        product_template_attribute_values = env[
             "product.template.attribute.value"
         ].search_fetch(
             [("attribute_id", "in", product_attributes.ids)],
@@ -38,9 +73,17 @@ class PosSession(models.Model):
                 "price_extra",
             ],
         )
-        product_template_attribute_values.product_attribute_value_id.fetch(
-            ["name", "is_custom", "html_color", "image"]
+        product_attribute_values = (
+            product_template_attribute_values.product_attribute_value_id
         )
+        # Images are not inlined: the POS gets them by URL from the template
+        # attribute value, only tell whether there is one.
+        attribute_values = {
+            vals["id"]: dict(vals, image=bool(vals["image"]))
+            for vals in product_attribute_values.with_context(bin_size=True).read(
+                ["name", "is_custom", "html_color", "image"]
+            )
+        }
 
         def key1(ptav):
             return (ptav.attribute_line_id.id, ptav.attribute_id.id)
@@ -55,9 +98,7 @@ class PosSession(models.Model):
             attribute_line_id, attribute = key
             values = [
                 {
-                    **ptav.product_attribute_value_id.read(
-                        ["name", "is_custom", "html_color", "image"]
-                    )[0],
+                    **attribute_values[ptav.product_attribute_value_id.id],
                     "price_extra": ptav.price_extra,
                     # id of a value should be from the
                     # "product.template.attribute.value" record
@@ -17,5 +17,14 @@ class PosSession(models.Model):
 
     @api.depends()
     def _compute_template_variants(self):
+        # Products are loaded page by page in the POS, count the variants of
+        # the whole page at once
+        variants = dict(
+            self._read_group(
+                [("product_tmpl_id", "in", self.product_tmpl_id.ids)],
+                ["product_tmpl_id"],
+                ["__count"],
+            )
+        )
         for record in self:
-            record.template_variants = len(record.product_tmpl_id.product_variant_ids)
+            record.template_variants = variants.get(record.product_tmpl_id, 0)
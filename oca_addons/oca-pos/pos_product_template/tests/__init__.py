@@ -0,0 +1 @@
+from . import test_product_template_values
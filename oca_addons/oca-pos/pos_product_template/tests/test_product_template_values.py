@@ -0,0 +1,90 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+
+from unittest.mock import patch
+
+from odoo import Command
+from odoo.tests.common import TransactionCase
+
+# 1x1 transparent PNG
+IMAGE = (
+    b"iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR4nGNgYGD4DwABBAEAwS2O"
+    b"UAAAAABJRU5ErkJggg=="
+)
+
+
+class TestProductTemplateValues(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.attribute = cls.env["product.attribute"].create(
+            {
+                "name": "POS Color",
+                "display_type": "color",
+                "value_ids": [
+                    Command.create({"name": "Red", "image": IMAGE}),
+                    Command.create({"name": "Blue"}),
+                ],
+            }
+        )
+        cls.red, cls.blue = cls.attribute.value_ids
+        cls.template = cls.env["product.template"].create(
+            {
+                "name": "POS Shirt",
+                "available_in_pos": True,
+                "attribute_line_ids": [
+                    Command.create(
+                        {
+                            "attribute_id": cls.attribute.id,
+                            "value_ids": [Command.set(cls.attribute.value_ids.ids)],
+                        }
+                    )
+                ],
+            }
+        )
+        cls.attribute_line = cls.template.attribute_line_ids
+        cls.session_model = cls.env["pos.session"]
+
+    def _get_values(self):
+        return {
+            value["id"]: value
+            for value in self.session_model._load_product_template_values()[
+                self.attribute_line.id
+            ]["values"]
+        }
+
+    def test_values(self):
+        values = self._get_values()
+        ptavs = self.attribute_line.product_template_value_ids
+        self.assertEqual(set(values), set(ptavs.ids))
+        red_ptav = ptavs.filtered(lambda v: v.product_attribute_value_id == self.red)
+        self.assertEqual(values[red_ptav.id]["name"], "Red")
+        # images are fetched by URL, only whether there is one is sent
+        self.assertIs(values[red_ptav.id]["image"], True)
+        blue_ptav = ptavs - red_ptav
+        self.assertIs(values[blue_ptav.id]["image"], False)
+
+    def test_cache(self):
+        self._get_values()
+        # only the version of the attributes is queried
+        with self.assertQueryCount(1):
+            values = self._get_values()
+        # the loaded values are a copy of the cached ones
+        next(iter(values.values()))["name"] = "Changed"
+        self.assertNotIn("Changed", [v["name"] for v in self._get_values().values()])
+
+    def test_cache_invalidation(self):
+        self._get_values()
+        with patch.object(type(self.env.registry), "clear_cache") as clear_cache:
+            self.blue.name = "Navy"
+        clear_cache.assert_not_called()
+        self.assertIn("Navy", [v["name"] for v in self._get_values().values()])
+        blue_ptav = self.attribute_line.product_template_value_ids.filtered(
+            lambda v: v.product_attribute_value_id == self.blue
+        )
+        blue_ptav.price_extra = 5.0
+        self.assertEqual(self._get_values()[blue_ptav.id]["price_extra"], 5.0)
+        green = self.env["product.attribute.value"].create(
+            {"name": "Green", "attribute_id": self.attribute.id}
+        )
+        self.attribute_line.value_ids = [Command.link(green.id)]
+        self.assertIn("Green", [v["name"] for v in self._get_values().values()])
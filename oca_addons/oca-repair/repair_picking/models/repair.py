@@ -1,7 +1,9 @@
 # Copyright 2023 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
-from odoo import api, fields, models
+from collections import defaultdict
+
+from odoo import Command, api, fields, models
 from odoo.exceptions import UserError
 
 
@@ -20,23 +22,45 @@ class RepairOrder(models.Model):
         return res
 
     def _action_launch_stock_rule(self, repair_lines):
-        for line in repair_lines:
-            warehouse = line.repair_id.location_id.warehouse_id
-            if (
-                warehouse.repair_steps in ["2_steps", "3_steps"]
+        """Launch the procurements of the repair lines, which may belong to
+        several repairs, with one procurement run per warehouse."""
+        lines_to_procure = repair_lines.filtered(
+            lambda line: (
+                line.repair_id.location_id.warehouse_id.repair_steps
+                in ["2_steps", "3_steps"]
                 and line.repair_line_type == "add"
-            ) or (
-                warehouse.repair_steps == "3_steps"
+            )
+            or (
+                line.repair_id.location_id.warehouse_id.repair_steps == "3_steps"
                 and line.repair_line_type == "recycle"
-            ):
-                self.with_context(should_be_assigned=True)._run_procurement_repair(line)
+            )
+        )
+        lines_to_procure.repair_id._create_procurement_group()
+        procurements_by_warehouse = defaultdict(list)
+        for line in lines_to_procure:
+            repair = line.repair_id
+            procurements_by_warehouse[repair.location_id.warehouse_id].append(
+                repair._prepare_procurement_repair(line)
+            )
+        for procurements in procurements_by_warehouse.values():
+            self.with_context(should_be_assigned=True)._run_procurements_repair(
+                procurements
+            )
         return True
 
+    def _create_procurement_group(self):
+        repairs = self.filtered(lambda repair: not repair.procurement_group_id)
+        groups = self.env["procurement.group"].create(
+            [{"name": repair.name} for repair in repairs]
+        )
+        for repair, group in zip(repairs, groups, strict=True):
+            repair.procurement_group_id = group
+
     def _run_procurement_repair(self, line):
-        procurements = []
+        return self._run_procurements_repair([self._prepare_procurement_repair(line)])
+
+    def _run_procurements_repair(self, procurements):
         errors = []
-        procurement = self._prepare_procurement_repair(line)
-        procurements.append(procurement)
         try:
             self.env["procurement.group"].run(procurements)
         except UserError as error:
@@ -93,8 +117,26 @@ class RepairOrder(models.Model):
         )
         return procurement
 
+    def _get_repair_picking_moves(self):
+        """Return the moves of the transfers of the repairs, by repair,
+        searched at once for all the repairs."""
+        moves = self.env["stock.move"].search(
+            [
+                "|",
+                ("repair_id", "in", self.ids),
+                ("related_repair_id", "in", self.ids),
+                ("picking_id", "!=", False),
+            ]
+        )
+        return moves.grouped(lambda move: move.repair_id or move.related_repair_id)
+
     def _update_stock_moves_and_picking_state(self):
-        self._compute_picking_ids()
+        picking_moves_by_repair = self._get_repair_picking_moves()
+        # Moves of the transfers adding components, by repair move to chain
+        add_links = defaultdict(lambda: self.env["stock.move"])
+        # Moves of the transfers recycling components, by repair move to chain
+        recycle_links = defaultdict(lambda: self.env["stock.move"])
+        pickings = self.env["stock.picking"]
         for repair in self:
             if repair.move_ids:
                 add_source_location = repair.move_ids._get_repair_locations("add")[0]
@@ -104,46 +146,48 @@ class RepairOrder(models.Model):
             else:
                 add_source_location = repair.location_id
                 recycle_dest_location = repair.location_id
-            for picking in repair.picking_ids:
-                if picking.location_dest_id == add_source_location:
-                    for move_line in picking.move_ids_without_package:
-                        stock_moves = repair.move_ids.filtered(
-                            lambda m, asl=add_source_location: m.repair_line_type
-                            == "add"
-                            and m.location_id.id == asl.id
-                        )
-                        if stock_moves:
-                            stock_moves[0].write(
-                                {
-                                    "move_orig_ids": [(4, move_line.id)],
-                                    "state": "waiting",
-                                }
-                            )
-                if picking.location_id.id == recycle_dest_location.id:
-                    for move_line in picking.move_ids_without_package:
-                        stock_moves = repair.move_ids.filtered(
-                            lambda m, rdl=recycle_dest_location: m.repair_line_type
-                            == "recycle"
-                            and m.location_dest_id.id == rdl.id
-                        )
-                        if stock_moves:
-                            move_line.write(
-                                {
-                                    "move_orig_ids": [(4, stock_moves[0].id)],
-                                    "state": "waiting",
-                                }
-                            )
-                # We are using write here because
-                # the repair_stock_move module does not use stock rules.
-                # As a result, we manually link the stock moves
-                # and then recompute the state of the picking.
-                picking._compute_state()
+            add_moves = repair.move_ids.filtered(
+                lambda m, asl=add_source_location: m.repair_line_type == "add"
+                and m.location_id == asl
+            )
+            recycle_moves = repair.move_ids.filtered(
+                lambda m, rdl=recycle_dest_location: m.repair_line_type == "recycle"
+                and m.location_dest_id == rdl
+            )
+            repair_picking_moves = picking_moves_by_repair.get(
+                repair, self.env["stock.move"]
+            )
+            pickings |= repair_picking_moves.picking_id
+            for picking in repair_picking_moves.picking_id:
+                picking_moves = picking.move_ids_without_package
+                if not picking_moves:
+                    continue
+                if add_moves and picking.location_dest_id == add_source_location:
+                    add_links[add_moves[0]] |= picking_moves
+                if recycle_moves and picking.location_id == recycle_dest_location:
+                    recycle_links[recycle_moves[0]] |= picking_moves
+        # We are using write here because
+        # the repair_stock_move module does not use stock rules.
+        # As a result, we manually link the stock moves
+        # and then recompute the state of the pickings.
+        for move, picking_moves in add_links.items():
+            move.write(
+                {
+                    "move_orig_ids": [Command.link(m.id) for m in picking_moves],
+                    "state": "waiting",
+                }
+            )
+        for move, picking_moves in recycle_links.items():
+            picking_moves.write(
+                {"move_orig_ids": [Command.link(move.id)], "state": "waiting"}
+            )
+        pickings._compute_state()
+        self.invalidate_recordset(["picking_ids", "picking_count"])
 
     def _action_repair_confirm(self):
         res = super()._action_repair_confirm()
-        for repair in self:
-            repair._action_launch_stock_rule(repair.move_ids)
-            repair._update_stock_moves_and_picking_state()
+        self._action_launch_stock_rule(self.move_ids)
+        self._update_stock_moves_and_picking_state()
         return res
 
     @api.onchange("location_id")
@@ -18,8 +18,9 @@ class StockMove(models.Model):
     def create(self, vals_list):
         moves = super().create(vals_list)
         if not self._context.get("should_be_assigned", False):
-            for move in moves:
-                repair = move.related_repair_id or move.repair_id
+            for repair, repair_moves in moves.grouped(
+                lambda move: move.related_repair_id or move.repair_id
+            ).items():
                 if repair.state in ["confirmed", "under_repair"]:
-                    repair._action_launch_stock_rule(move)
+                    repair._action_launch_stock_rule(repair_moves)
         return moves
@@ -1,2 +1,3 @@
 from . import test_stock_repair_warehouse
 from . import test_stock_repair_order
+from . import test_repair_picking_benchmark
@@ -0,0 +1,79 @@
+# Copyright 2023 ForgeFlow S.L. (https://www.forgeflow.com)
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+
+from odoo.tests import common
+
+
+class TestRepairPickingCommon(common.TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.repair_model = cls.env["repair.order"]
+        cls.repair_line_model = cls.env["stock.move"]
+        cls.product_model = cls.env["product.product"]
+        cls.stock_location_model = cls.env["stock.location"]
+        cls.warehouse_model = cls.env["stock.warehouse"]
+        cls.company = cls.env.ref("base.main_company")
+        cls.warehouse = cls.warehouse_model.create(
+            {
+                "name": "Test Warehouse",
+                "code": "TW",
+                "company_id": cls.company.id,
+            }
+        )
+
+        cls.product1 = cls.product_model.create(
+            {
+                "name": "Product 1",
+                "type": "product",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.product2 = cls.product_model.create(
+            {
+                "name": "Product 2",
+                "type": "product",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.repair_location = cls.stock_location_model.create(
+            {
+                "name": "Repair Location",
+                "usage": "internal",
+                "location_id": cls.warehouse.view_location_id.id,
+                "company_id": cls.company.id,
+            }
+        )
+        cls.production_location = cls.stock_location_model.create(
+            {
+                "name": "Production Location",
+                "usage": "production",
+                "company_id": cls.company.id,
+            }
+        )
+        cls.env["stock.quant"].create(
+            {
+                "product_id": cls.product1.id,
+                "location_id": cls.repair_location.id,
+                "quantity": 10,
+            }
+        )
+        cls.env["stock.quant"].create(
+            {
+                "product_id": cls.product2.id,
+                "location_id": cls.warehouse.lot_stock_id.id,
+                "quantity": 10,
+            }
+        )
+
+    def _crate_repair_order(self):
+        return self.repair_model.create(
+            {
+                "product_id": self.product1.id,
+                "product_uom": self.product1.uom_id.id,
+                "location_id": self.repair_location.id,
+                "company_id": self.company.id,
+                "picking_type_id": self.warehouse.repair_type_id.id,
+            }
+        )
@@ -0,0 +1,64 @@
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
+import logging
+import time
+
+from odoo.tests import tagged
+
+from .common import TestRepairPickingCommon
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged("-standard", "repair_picking_benchmark")
+class TestRepairPickingBenchmark(TestRepairPickingCommon):
+    """Timings on large volumes, run with
+    ``--test-tags repair_picking_benchmark``."""
+
+    def test_confirm_repairs_with_many_components(self):
+        self.warehouse.write(
+            {
+                "repair_steps": "3_steps",
+                "repair_location_id": self.repair_location.id,
+            }
+        )
+        self.product2.write(
+            {"route_ids": [(6, 0, [self.warehouse.repair_route_id.id])]}
+        )
+        repair_orders = self.repair_model.browse(
+            [self._crate_repair_order().id for __ in range(20)]
+        )
+        self.repair_line_model.create(
+            [
+                {
+                    "name": "Repair Line %s" % index,
+                    "repair_id": repair_order.id,
+                    "product_id": self.product2.id,
+                    "repair_line_type": ("add", "recycle")[index % 2],
+                    "product_uom_qty": 1,
+                    "product_uom": self.product2.uom_id.id,
+                    "price_unit": 1,
+                    "location_id": (
+                        self.repair_location.id
+                        if index % 2 == 0
+                        else self.production_location.id
+                    ),
+                    "location_dest_id": (
+                        self.production_location.id
+                        if index % 2 == 0
+                        else self.repair_location.id
+                    ),
+                }
+                for repair_order in repair_orders
+                for index in range(100)
+            ]
+        )
+        start = time.perf_counter()
+        repair_orders._action_repair_confirm()
+        self.env.flush_all()
+        _logger.info(
+            "%s repairs with %s components confirmed in %.2fs",
+            len(repair_orders),
+            len(repair_orders.move_ids),
+            time.perf_counter() - start,
+        )
+        self.assertEqual(set(repair_orders.mapped("state")), {"confirmed"})
@@ -1,83 +1,12 @@
 # Copyright 2023 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
-from odoo.tests import common
+from unittest.mock import patch
 
+from .common import TestRepairPickingCommon
 
-class TestStockRepairOrder(common.TransactionCase):
-    @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-
-        cls.repair_model = cls.env["repair.order"]
-        cls.repair_line_model = cls.env["stock.move"]
-        cls.product_model = cls.env["product.product"]
-        cls.stock_location_model = cls.env["stock.location"]
-        cls.warehouse_model = cls.env["stock.warehouse"]
-        cls.company = cls.env.ref("base.main_company")
-        cls.warehouse = cls.warehouse_model.create(
-            {
-                "name": "Test Warehouse",
-                "code": "TW",
-                "company_id": cls.company.id,
-            }
-        )
-
-        cls.product1 = cls.product_model.create(
-            {
-                "name": "Product 1",
-                "type": "product",
-                "company_id": cls.company.id,
-            }
-        )
-        cls.product2 = cls.product_model.create(
-            {
-                "name": "Product 2",
-                "type": "product",
-                "company_id": cls.company.id,
-            }
-        )
-        cls.repair_location = cls.stock_location_model.create(
-            {
-                "name": "Repair Location",
-                "usage": "internal",
-                "location_id": cls.warehouse.view_location_id.id,
-                "company_id": cls.company.id,
-            }
-        )
-        cls.production_location = cls.stock_location_model.create(
-            {
-                "name": "Production Location",
-                "usage": "production",
-                "company_id": cls.company.id,
-            }
-        )
-        cls.env["stock.quant"].create(
-            {
-                "product_id": cls.product1.id,
-                "location_id": cls.repair_location.id,
-                "quantity": 10,
-            }
-        )
-        cls.env["stock.quant"].create(
-            {
-                "product_id": cls.product2.id,
-                "location_id": cls.warehouse.lot_stock_id.id,
-                "quantity": 10,
-            }
-        )
-
-    def _crate_repair_order(self):
-        return self.repair_model.create(
-            {
-                "product_id": self.product1.id,
-                "product_uom": self.product1.uom_id.id,
-                "location_id": self.repair_location.id,
-                "company_id": self.company.id,
-                "picking_type_id": self.warehouse.repair_type_id.id,
-            }
-        )
 
+class TestStockRepairOrder(TestRepairPickingCommon):
     def test_1step_repair_order_flow(self):
         self.warehouse.write(
             {
@@ -260,3 +189,47 @@ class TestStockRepairOrder(common.TransactionCase):
         )
         repair_order._compute_picking_ids()
         self.assertEqual(len(repair_order.picking_ids), 2)
+
+    def test_2steps_repair_order_batch_confirm(self):
+        self.warehouse.write(
+            {
+                "repair_steps": "2_steps",
+                "repair_location_id": self.repair_location.id,
+            }
+        )
+        self.product2.write(
+            {"route_ids": [(6, 0, [self.warehouse.repair_route_id.id])]}
+        )
+        repair_orders = self._crate_repair_order() | self._crate_repair_order()
+        self.repair_line_model.create(
+            [
+                {
+                    "name": "Repair Line %s" % index,
+                    "repair_id": repair_order.id,
+                    "product_id": self.product2.id,
+                    "repair_line_type": "add",
+                    "product_uom_qty": 1,
+                    "product_uom": self.product2.uom_id.id,
+                    "price_unit": 1,
+                    "location_id": self.repair_location.id,
+                    "location_dest_id": self.production_location.id,
+                }
+                for repair_order in repair_orders
+                for index in range(2)
+            ]
+        )
+        ProcurementGroup = self.env.registry["procurement.group"]
+        with patch.object(
+            ProcurementGroup, "run", side_effect=ProcurementGroup.run, autospec=True
+        ) as run:
+            repair_orders._action_repair_confirm()
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(len(run.call_args.args[1]), 4)
+        self.assertEqual(len(repair_orders.procurement_group_id), 2)
+        for repair_order in repair_orders:
+            self.assertEqual(repair_order.state, "confirmed")
+            repair_order._compute_picking_ids()
+            self.assertEqual(len(repair_order.picking_ids), 1)
+            self.assertEqual(
+                repair_order.picking_ids.group_id, repair_order.procurement_group_id
+            )
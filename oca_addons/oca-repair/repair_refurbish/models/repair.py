@@ -73,22 +73,30 @@ class RepairOrder(models.Model):
     def action_repair_done(self):
         to_refurbish_orders = self.filtered("to_refurbish")
         res = super(RepairOrder, (self - to_refurbish_orders)).action_repair_done()
-        for repair in to_refurbish_orders:
-            refurbish_loc = self._get_virtual_refurbish_location()
+        # Complete the repairs sharing the same refurbish location together
+        for refurbish_loc, repairs in to_refurbish_orders.grouped(
+            lambda repair: repair._get_virtual_refurbish_location()
+        ).items():
             super(
                 RepairOrder,
-                repair.with_context(
+                repairs.with_context(
                     force_refurbish_location_dest_id=refurbish_loc.id,
-                    to_refurbish=repair.to_refurbish,
+                    to_refurbish=True,
                 ),
             ).action_repair_done()
-            if repair.to_refurbish:
-                move = self.env["stock.move"].create(
-                    repair._get_refurbish_stock_move_dict()
-                )
-                move._action_confirm()
-                move.quantity = repair.product_qty
-                move.picked = True
-                move._action_done()
-                repair.refurbish_move_id = move.id
+        if to_refurbish_orders:
+            to_refurbish_orders._create_refurbish_moves()
         return res
+
+    def _create_refurbish_moves(self):
+        """Create and validate the refurbish moves of all the repairs at once."""
+        moves = self.env["stock.move"].create(
+            [repair._get_refurbish_stock_move_dict() for repair in self]
+        )
+        moves._action_confirm(merge=False)
+        for repair, move in zip(self, moves, strict=True):
+            move.quantity = repair.product_qty
+            repair.refurbish_move_id = move.id
+        moves.picked = True
+        moves._action_done()
+        return moves
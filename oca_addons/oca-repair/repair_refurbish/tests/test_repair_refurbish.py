@@ -135,3 +135,31 @@ class TestMrpMtoWithStock(TransactionCase):
         self.assertEqual(len(repaired_move), 1)
         self.assertEqual(repaired_move.location_id, self.stock_location_stock)
         self.assertEqual(repaired_move.location_dest_id, self.stock_location_stock)
+
+    def test_03_repair_refurbish_batch(self):
+        """Tests that several repairs to refurbish are completed together."""
+        repairs = self.repair_obj.create(
+            [
+                {
+                    "product_id": self.product.id,
+                    "product_qty": qty,
+                    "product_uom": self.product.uom_id.id,
+                    "picking_type_id": self.warehouse.repair_type_id.id,
+                }
+                for qty in (1.0, 2.0)
+            ]
+        )
+        for repair in repairs:
+            repair.to_refurbish = True
+            repair._onchange_to_refurbish()
+        repairs.action_validate()
+        repairs.action_repair_start()
+        repairs.action_repair_end()
+        self.assertEqual(set(repairs.mapped("state")), {"done"})
+        for repair in repairs:
+            move = repair.refurbish_move_id
+            self.assertEqual(move.state, "done")
+            self.assertEqual(move.product_id, self.refurbish_product)
+            self.assertEqual(move.quantity, repair.product_qty)
+            self.assertEqual(move.location_id, self.refurbish_loc)
+            self.assertEqual(move.location_dest_id, self.stock_location_stock)
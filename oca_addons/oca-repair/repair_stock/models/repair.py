@@ -1,7 +1,9 @@
 # Copyright 2024 ForgeFlow S.L. (https://www.forgeflow.com)
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl.html).
 
-from odoo import fields, models
+from collections import defaultdict
+
+from odoo import Command, fields, models
 
 
 class RepairOrder(models.Model):
@@ -26,16 +28,22 @@ class RepairOrder(models.Model):
         return action
 
     def _compute_picking_ids(self):
+        # TODO: migration note: `repair_id` should not be used here
+        #  in v18, use `related_repair_id` instead while migrating
+        #  modules depending on this.
+        picking_ids_by_repair = defaultdict(set)
+        for repair, related_repair, picking in self.env["stock.move"]._read_group(
+            [
+                "|",
+                ("repair_id", "in", self.ids),
+                ("related_repair_id", "in", self.ids),
+                ("picking_id", "!=", False),
+            ],
+            ["repair_id", "related_repair_id", "picking_id"],
+        ):
+            picking_ids_by_repair[repair.id].add(picking.id)
+            picking_ids_by_repair[related_repair.id].add(picking.id)
         for order in self:
-            # TODO: migration note: `repair_id` should not be used here
-            #  in v18, use `related_repair_id` instead while migrating
-            #  modules depending on this.
-            moves = self.env["stock.move"].search(
-                [
-                    "|",
-                    ("repair_id", "=", order.id),
-                    ("related_repair_id", "=", order.id),
-                ]
-            )
-            order.picking_ids = moves.mapped("picking_id")
-            order.picking_count = len(moves.mapped("picking_id"))
+            picking_ids = picking_ids_by_repair[order.id]
+            order.picking_ids = [Command.set(list(picking_ids))]
+            order.picking_count = len(picking_ids)
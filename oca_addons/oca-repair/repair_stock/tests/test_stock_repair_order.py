@@ -118,6 +118,19 @@ class TestStockRepairOrder(common.TransactionCase):
         self.assertTrue(repair_order.picking_ids)
         self.assertEqual(len(repair_order.picking_ids), 1)
 
+    def test_compute_pickings_batch(self):
+        repair_order_1 = self._create_repair_order(self.product1)
+        repair_order_2 = self._create_repair_order(self.product1)
+        repair_orders = repair_order_1 | repair_order_2
+        repair_orders._action_repair_confirm()
+        picking_1 = self._create_picking_and_move(repair_order_1)
+        picking_2 = self._create_picking_and_move(repair_order_2)
+        repair_orders.invalidate_recordset(["picking_ids", "picking_count"])
+        self.assertEqual(repair_order_1.picking_ids, picking_1)
+        self.assertEqual(repair_order_1.picking_count, 1)
+        self.assertEqual(repair_order_2.picking_ids, picking_2)
+        self.assertEqual(repair_order_2.picking_count, 1)
+
     def test_action_view_pickings(self):
         repair_order = self._create_repair_order(self.product1)
         repair_order._action_repair_confirm()